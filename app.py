@@ -1,9 +1,12 @@
-import json
+import copy
+import hashlib
+import hmac
+import time
+import uuid
 import datetime as dt
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import pandas as pd
-import requests
 import streamlit as st
 from openai import APIConnectionError, OpenAI, RateLimitError
 
@@ -11,8 +14,10 @@ from openai import APIConnectionError, OpenAI, RateLimitError
 from bloomu.constants import (
     APP_NAME,
     BADGES,
+    CONTEXT_TOKEN_BUDGET,
     DAYS,
     DOMAIN_OPTIONS,
+    EVIDENCE_BUDGET_S,
     IDX_TO_DAY,
     LEVEL_OPTIONS,
     MODEL,
@@ -24,7 +29,13 @@ from bloomu.constants import (
     TONE_OPTIONS,
     UNCERTAINTY_OPTIONS,
 )
-from bloomu.evidence import curated_sources, serper_search
+from bloomu.allowlist import SOURCE_ALLOWLIST
+from bloomu.answer_cache import AnswerCache, answer_cache_bucket
+from bloomu.context import build_chat_context
+from bloomu.daily import DailyPatternColumns, DailyRollup
+from bloomu.dashboard import DashboardCache, build_week_row
+from bloomu.evidence import configure_search_cache, resolve_sources, search_cache_stats
+from bloomu.evidence_index import get_evidence_index
 from bloomu.helpers import (
     detect_high_risk,
     ensure_task_shape,
@@ -34,12 +45,20 @@ from bloomu.helpers import (
     move_task_to_next_slot,
     normalize_day_label,
     sort_tasks_for_day,
-    task_uid,
     today,
     week_key,
     week_label_yy_mm_ww_from_week_start,
     week_start_from_key,
 )
+from bloomu.jsonstream import IncrementalJSONObject, parse_json_tolerant
+from bloomu.notion import notion_export_weeks, notion_sync_week
+from bloomu.plan_store import PlanStore
+from bloomu.preload import Preloader, build_daily_tables
+from bloomu.retrieval import prefetch_domain, start_hybrid_lookup
+from bloomu.scheduler import KeyScheduler
+from bloomu.schema import COACHING_SCHEMA, api_schema, validate_coaching
+from bloomu.storage import SQLiteStorage, Storage, task_row_key
+from bloomu.tracing import Tracer, TurnTrace
 
 
 def update_streak_and_badges():
@@ -106,42 +125,51 @@ def update_core_context_from_chat(user_text: str, wk: str):
         core["constraints"] = signals["constraints"]
     core["last_user_message"] = user_text
     core["updated_at"] = dt.datetime.now().isoformat()
+    persist("core_week", wk, core)
 
 def update_core_context_from_plan(wk: str, tasks: Optional[List[Dict[str, Any]]] = None):
     core = get_week_core_context(wk)
-    tasks = tasks if tasks is not None else (st.session_state.plan_by_week.get(wk, []) or [])
-    done = sum(1 for t in tasks if t.get("status") == "체크")
-    total = len(tasks)
+    if tasks is None:
+        done = st.session_state.plan_by_week.count(wk, "체크")
+        total = st.session_state.plan_by_week.count(wk)
+    else:
+        done = sum(1 for t in tasks if t.get("status") == "체크")
+        total = len(tasks)
     completion = round(100 * done / total, 1) if total else None
-    core["plan"] = {"tasks": total, "done": done, "completion": completion}
+    plan = {"tasks": total, "done": done, "completion": completion}
+    if core.get("plan") == plan:
+        return
+    core["plan"] = plan
     core["updated_at"] = dt.datetime.now().isoformat()
+    persist("core_week", wk, core)
 
 def update_core_context_from_survey(wk: str, survey: Dict[str, Any]):
     core = get_week_core_context(wk)
     core["survey"] = dict(survey or {})
     core["updated_at"] = dt.datetime.now().isoformat()
+    persist("core_week", wk, core)
 
 def update_core_context_from_ab_metrics(wk: str, metrics: Dict[str, Any]):
     core = get_week_core_context(wk)
     core["ab_metrics"] = dict(metrics or {})
     core["updated_at"] = dt.datetime.now().isoformat()
+    persist("core_week", wk, core)
 
 def unlock_badges():
     if any(m["role"] == "user" for m in st.session_state.messages):
         st.session_state.badges_unlocked.add("first_chat")
 
-    any_tasks = any((st.session_state.plan_by_week.get(wk) or []) for wk in st.session_state.plan_by_week.keys())
-    if any_tasks:
+    if st.session_state.plan_by_week.total():
         st.session_state.badges_unlocked.add("first_plan")
 
     wk = st.session_state.active_plan.get("week", week_key())
-    tasks = st.session_state.plan_by_week.get(wk, []) or []
-    update_core_context_from_plan(wk, tasks)
-    done = sum(1 for t in tasks if t.get("status") == "체크")
+    update_core_context_from_plan(wk)
+    done = st.session_state.plan_by_week.count(wk, "체크")
+    total = st.session_state.plan_by_week.count(wk)
     if done >= 3:
         st.session_state.badges_unlocked.add("plan_3_done")
 
-    if tasks and all(t.get("status") == "체크" for t in tasks):
+    if total and done == total:
         st.session_state.badges_unlocked.add("plan_7_done")
 
     if week_key() in st.session_state.survey:
@@ -156,11 +184,12 @@ def ensure_state():
             "evidence_mode": True,
             "anonymous_mode": True,
             "nickname": "익명",
+            "answer_cache": False,
         }
     if "messages" not in st.session_state:
         st.session_state.messages = []
     if "plan_by_week" not in st.session_state:
-        st.session_state.plan_by_week = {}
+        st.session_state.plan_by_week = PlanStore()
     if "active_plan" not in st.session_state:
         st.session_state.active_plan = {
             "week": week_key(),
@@ -183,6 +212,14 @@ def ensure_state():
         st.session_state.last_sources_pool = []
     if "welcome_signature" not in st.session_state:
         st.session_state.welcome_signature = ""
+    if "loaded_collections" not in st.session_state:
+        st.session_state.loaded_collections = set()
+    if "llm_usage" not in st.session_state:
+        st.session_state.llm_usage = {}  # 누적 input/cached/output 토큰 + last
+    if "dashboard_cache" not in st.session_state:
+        st.session_state.dashboard_cache = DashboardCache()
+    if "preloader" not in st.session_state:
+        st.session_state.preloader = Preloader()
     ensure_core_context()
 
     # ✅ 사용자 Notion 입력 기반 저장(1번)
@@ -192,10 +229,12 @@ def ensure_state():
             "db_id": "",
             "title_prop": "Name",  # 사용자 DB의 Title property 이름
         }
+    if "notion_sync" not in st.session_state:
+        st.session_state.notion_sync = {}  # {db_id: {week: {page_id, blocks, snapshot}}}
         # ✅ 데일리 패턴 체크 저장소 (날짜별 누적)
     # (호환) daily_pattern / daily_patterns 둘 다 지원
     if "daily_pattern" not in st.session_state and "daily_patterns" not in st.session_state:
-        st.session_state.daily_pattern = {}
+        st.session_state.daily_pattern = DailyPatternColumns()
 
     # 누군가 daily_patterns를 쓰는 경우도 있어 동기화
     if "daily_patterns" not in st.session_state:
@@ -204,28 +243,173 @@ def ensure_state():
         st.session_state.daily_pattern = st.session_state.daily_patterns
 
 # =========================
-# Prompting & Parsing
+# Persistent Storage (선택)
 # =========================
-def build_system_prompt(settings: Dict[str, Any]) -> str:
-    nickname = settings["nickname"]
-    tone = settings["tone"]
-    level = settings["level"]
-    domain = settings["domain"]
-    evidence_mode = settings["evidence_mode"]
+# ✅ secrets에 BLOOMU_DB_PATH가 있으면 SQLite에 "바뀐 행"만 저장 → 재시작/다중 워커에서도 유지
+@st.cache_resource(show_spinner=False)
+def get_storage() -> Optional[Storage]:
+    path = st.secrets.get("BLOOMU_DB_PATH", "")
+    return SQLiteStorage(path) if path else None
+
+# ✅ 저장소 키 = HMAC(서버 secret, 사용자 '기록 코드'). 상담 기록까지 담기므로 키를 URL에 남기지 않는다.
+# 기록 코드는 사용자가 사이드바에서 확인/보관하고, 다른 기기나 새 세션에서 입력해 불러온다.
+def user_key_from_code(code: str) -> str:
+    secret = st.secrets.get("BLOOMU_USER_SECRET", "")
+    return hmac.new(secret.encode("utf-8"), code.strip().encode("utf-8"), hashlib.sha256).hexdigest()
+
+def use_restore_code(code: str):
+    st.session_state.restore_code = code
+    st.session_state.user_id = user_key_from_code(code)
+
+def get_user_id() -> str:
+    if "user_id" not in st.session_state:
+        use_restore_code(uuid.uuid4().hex)
+        legacy_uid = st.query_params.get("uid")
+        if legacy_uid:
+            # 예전 ?uid= 링크: URL에서 지우고, 그 기록을 새 코드의 키로 옮긴다(옛 링크로는 더 이상 열리지 않음).
+            del st.query_params["uid"]
+            storage = get_storage()
+            if storage is not None:
+                storage.rekey(legacy_uid, st.session_state.user_id)
+    return st.session_state.user_id
+
+def persist(kind: str, key: str, value: Any):
+    storage = get_storage()
+    if storage is not None:
+        storage.put(get_user_id(), kind, key, value)
+
+def unpersist(kind: str, key: str):
+    storage = get_storage()
+    if storage is not None:
+        storage.delete(get_user_id(), kind, key)
+
+def persist_task(t: Dict[str, Any]):
+    persist("task", task_row_key(t), t)
+
+def persist_message(m: Dict[str, Any]):
+    persist("message", uuid.uuid4().hex, m)
+
+# 탭마다 필요한 데이터만 처음 열 때 불러온다(lazy load).
+TAB_COLLECTIONS = {
+    "채팅": ["plan_by_week", "survey", "ab_metrics", "core_context"],
+    "주간 액티브 플랜": ["plan_by_week", "survey", "core_context", "notion_sync"],
+    "전략 A/B 측정": ["ab_metrics", "core_context"],
+    "데일리 패턴 체크": ["daily_patterns"],
+    "뱃지": ["plan_by_week", "survey", "core_context"],
+    "주간 자가설문": ["survey", "plan_by_week", "core_context"],
+    "주간 리포트/성장 대시보드": ["survey", "ab_metrics", "plan_by_week", "core_context"],
+}
+
+def get_daily_rollup() -> DailyRollup:
+    if "daily_rollup" not in st.session_state:
+        st.session_state.daily_rollup = DailyRollup.from_records(st.session_state.daily_patterns)
+    return st.session_state.daily_rollup
 
-    tone_rules = "\n".join([f"- {x}" for x in TONE_GUIDE.get(tone, [])])
-
-    return f"""
-당신은 20대 대학생들이 맞이할 모든 첫 시작을 도울 러닝메이트 코칭 매니저입니다.
-사용자의 닉네임은 '{nickname}'이며 반드시 이 이름으로 부르세요.
+# =========================
+# Background preload (대시보드/데일리 탭)
+# =========================
+def dashboard_weeks() -> List[str]:
+    return sorted(set(list(st.session_state.survey.keys()) + list(st.session_state.ab_metrics.keys()) + list(st.session_state.plan_by_week.keys())))
 
-[말투/레벨/분야]
-- 말투: {tone}
-- 레벨: {level}
-- 분야: {domain}
+def dashboard_row_inputs(wk: str) -> Tuple[str, Dict[str, Any], Dict[str, Any], int, int]:
+    core = get_week_core_context(wk)
+    s = st.session_state.survey.get(wk, {}) or core.get("survey", {})
+    m = st.session_state.ab_metrics.get(wk, {}) or core.get("ab_metrics", {})
+    store = st.session_state.plan_by_week
+    return wk, s, m, store.count(wk), store.count(wk, "체크")
+
+# 탭별 작업 = (key 함수, 준비 함수). key는 이미 있는 변경 카운터만 모으므로 매 실행 불러도 싸고,
+# 준비 함수(스냅샷 복사)는 key가 바뀌었을 때만 메인 스레드에서 1번 돈다.
+def dashboard_preload_key() -> Optional[Tuple[Any, ...]]:
+    weeks = dashboard_weeks()
+    if not weeks:
+        return None
+    return st.session_state.dashboard_cache.preload_key(weeks, st.session_state.plan_by_week.version)
+
+def dashboard_preload_job() -> Tuple[Callable[..., Any], tuple]:
+    # 바뀐 주차의 행 입력만 떠서 DashboardCache를 미리 채운다(탭은 같은 캐시에서 바로 꺼내 씀).
+    cache = st.session_state.dashboard_cache
+    weeks = dashboard_weeks()
+    sigs = cache.signatures(weeks, st.session_state.plan_by_week.version)
+    inputs = {}
+    for wk in cache.stale_weeks(sigs):
+        update_core_context_from_plan(wk)
+        inputs[wk] = copy.deepcopy(dashboard_row_inputs(wk))
+    return cache.warm, (weeks, sigs, inputs)
+
+def daily_preload_key() -> Optional[Tuple[int, int]]:
+    if not st.session_state.daily_patterns:
+        return None
+    return st.session_state.daily_patterns.version, get_daily_rollup().version
+
+def daily_preload_job() -> Tuple[Callable[..., Any], tuple]:
+    rollup = get_daily_rollup()
+    return build_daily_tables, (copy.deepcopy(rollup.monthly), copy.deepcopy(rollup.yearly))
+
+PRELOAD_JOBS = {
+    "dashboard": (dashboard_preload_key, dashboard_preload_job),
+    "daily": (daily_preload_key, daily_preload_job),
+}
+
+# 지금 상태와 같은 입력으로 미리 계산된 결과가 있으면 반환(없거나 아직 계산 중이면 None)
+def preloaded(name: str) -> Optional[Any]:
+    key = PRELOAD_JOBS[name][0]()
+    return None if key is None else st.session_state.preloader.get(name, key)
+
+# ✅ 스크립트 끝에서 호출: 입력이 바뀐 탭 결과물만 백그라운드로 미리 계산
+# (아직 안 끝났으면 탭에서 평소처럼 동기 계산)
+def schedule_preloads():
+    preloader = st.session_state.preloader
+    for name, (make_key, make_job) in PRELOAD_JOBS.items():
+        key = make_key()
+        if key is not None and not preloader.is_current(name, key):
+            fn, args = make_job()
+            preloader.submit(name, key, fn, *args)
+
+def ensure_loaded(*names: str):
+    storage = get_storage()
+    if storage is None:
+        return
+    uid = get_user_id()
+    loaded = st.session_state.loaded_collections
+    for name in names:
+        if name in loaded:
+            continue
+        if name == "plan_by_week":
+            plan: Dict[str, List[Dict[str, Any]]] = {}
+            for t in storage.load(uid, "task").values():
+                plan.setdefault(t.get("week") or week_key(), []).append(t)
+            st.session_state.plan_by_week = PlanStore.from_dict(plan)
+        elif name == "survey":
+            st.session_state.survey = storage.load(uid, "survey")
+        elif name == "ab_metrics":
+            st.session_state.ab_metrics = storage.load(uid, "ab_metrics")
+        elif name == "daily_patterns":
+            st.session_state.daily_patterns = DailyPatternColumns.from_records(storage.load(uid, "daily"))
+            st.session_state.daily_pattern = st.session_state.daily_patterns
+            st.session_state.pop("daily_rollup", None)
+        elif name == "core_context":
+            st.session_state.core_context["weeks"] = storage.load(uid, "core_week")
+        elif name == "notion_sync":
+            for key, record in storage.load(uid, "notion_sync").items():
+                dbid, _, wk = key.partition("|")
+                st.session_state.notion_sync.setdefault(dbid, {})[wk] = record
+        elif name == "messages":
+            stored = list(storage.load(uid, "message").values())
+            if stored:
+                st.session_state.messages = stored
+        loaded.add(name)
+        st.session_state.dashboard_cache.clear()
 
-[말투 규칙(반드시 준수)]
-{tone_rules}
+# =========================
+# Prompting & Parsing
+# =========================
+# ✅ 프롬프트 캐싱: 모든 사용자에게 동일한 정적 앞부분(원칙/리스크/스키마)을 먼저 두고,
+# 닉네임·말투·레벨·분야처럼 사용자마다 다른 부분은 뒤쪽 짧은 suffix로 분리한다.
+# (정적 부분에는 f-string 치환을 넣지 말 것: 한 글자라도 바뀌면 캐시가 깨진다)
+SYSTEM_PROMPT_STATIC = f"""
+당신은 20대 대학생들이 맞이할 모든 첫 시작을 도울 러닝메이트 코칭 매니저입니다.
+사용자 정보와 말투 규칙은 맨 아래 [사용자 설정]에 있으며, 반드시 그대로 따르세요.
 
 [핵심 원칙]
 - 공감(다정함) + 현실 조언(실행 가능한 조언)을 함께 제공합니다.
@@ -239,8 +423,7 @@ def build_system_prompt(settings: Dict[str, Any]) -> str:
   - 전문가 상담 권고 + 대체 안전 행동 2~4개를 반드시 포함합니다.
 
 [증거기반모드]
-- evidence_mode={str(evidence_mode).lower()}
-- 증거기반모드가 켜져 있을 때, '사실(정보)' 항목에는 아래 'SOURCES'로 제공되는 링크들만 근거로 사용하세요.
+- [사용자 설정]의 evidence_mode가 true일 때, '사실(정보)' 항목에는 사용자 메시지의 'SOURCES'로 제공되는 링크들만 근거로 사용하세요.
 - 링크가 충분하지 않으면, 사실 항목은 최소화하고 불확실성 태그를 '추정' 또는 '보통'으로 조정하세요.
 
 [출력 형식]
@@ -266,6 +449,27 @@ JSON 스키마:
 """.strip()
 
 
+def build_user_profile_prompt(settings: Dict[str, Any]) -> str:
+    tone = settings["tone"]
+    tone_rules = "\n".join([f"- {x}" for x in TONE_GUIDE.get(tone, [])])
+
+    return f"""
+[사용자 설정]
+- 닉네임: '{settings["nickname"]}' (반드시 이 이름으로 부르세요)
+- 말투: {tone}
+- 레벨: {settings["level"]}
+- 분야: {settings["domain"]}
+- evidence_mode={str(settings["evidence_mode"]).lower()}
+
+[말투 규칙(반드시 준수)]
+{tone_rules}
+""".strip()
+
+
+def build_system_prompt(settings: Dict[str, Any]) -> str:
+    return f"{SYSTEM_PROMPT_STATIC}\n\n{build_user_profile_prompt(settings)}"
+
+
 def build_welcome_message(settings: Dict[str, Any]) -> str:
     nickname = settings.get("nickname", "익명")
     tone = settings.get("tone", TONE_OPTIONS[0])
@@ -319,31 +523,151 @@ def ensure_welcome_message():
         first["content"] = build_welcome_message(settings)
         st.session_state.welcome_signature = signature
 
-def call_openai_json(api_key: str, sys_prompt: str, user_prompt: str, chat: List[Dict[str, str]]) -> Dict[str, Any]:
-    client = OpenAI(api_key=api_key)
-    context = chat[-12:] if len(chat) > 12 else chat
+# ✅ API Key별 OpenAI 클라이언트 재사용(리런/세션 간 공유) → keep-alive 커넥션 풀 유지
+# max_entries를 넘으면 오래된 키부터 제거되고, ttl이 지나면 새로 만든다.
+# 재시도는 KeyScheduler가 한 곳에서 담당하므로 SDK 자체 재시도는 끈다.
+@st.cache_resource(max_entries=16, ttl=60 * 60, show_spinner=False)
+def get_openai_client(api_key: str) -> OpenAI:
+    return OpenAI(api_key=api_key, max_retries=0)
+
+# ✅ 같은 API Key를 쓰는 모든 세션이 대기열/속도 제한을 공유(키 원문 대신 sha256으로 구분)
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_key_scheduler(key_hash: str) -> KeyScheduler:
+    return KeyScheduler(
+        max_concurrent=int(st.secrets.get("OPENAI_MAX_CONCURRENCY", 4)),
+        requests_per_minute=float(st.secrets.get("OPENAI_RPM", 60)),
+    )
 
-    inp = [{"role": "system", "content": sys_prompt}]
-    for m in context:
-        inp.append({"role": m["role"], "content": m["content"]})
-    inp.append({"role": "user", "content": user_prompt})
+def api_key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+# 스트리밍 중 response.failed / error 이벤트(또는 종료 이벤트 없이 끊긴 스트림)
+class AIStreamError(RuntimeError):
+    def __init__(self, code: str, message: str):
+        super().__init__(message or "AI 응답 생성이 중간에 실패했어요.")
+        self.code = code or ""
+
+STREAM_RETRY_CODES = {"", "server_error", "rate_limit_exceeded"}
+
+def is_quota_exhausted(err: Exception) -> bool:
+    # 429 중에서도 크레딧/요금제 한도 소진은 기다려도 풀리지 않는다.
+    return getattr(err, "code", None) == "insufficient_quota"
+
+def is_retryable_ai_error(err: Exception) -> bool:
+    if is_quota_exhausted(err):
+        return False
+    if isinstance(err, AIStreamError):
+        return err.code in STREAM_RETRY_CODES
+    status = getattr(err, "status_code", None)
+    return isinstance(err, (RateLimitError, APIConnectionError)) or status == 429 or (status or 0) >= 500
+
+# ✅ 검색 캐시 설정(1회): SERPER_CACHE_PATH가 있으면 디스크(SQLite) 2차 캐시까지 사용
+@st.cache_resource(show_spinner=False)
+def init_search_cache() -> bool:
+    configure_search_cache(disk_path=st.secrets.get("SERPER_CACHE_PATH", "") or None)
+    return True
+
+# ✅ 로컬 근거 색인(FTS5, 1회 생성): EVIDENCE_INDEX_PATH가 있으면 디스크에 두고 재시작 후 재사용
+@st.cache_resource(show_spinner=False)
+def init_evidence_index() -> bool:
+    get_evidence_index(st.secrets.get("EVIDENCE_INDEX_PATH", "") or None)
+    return True
+
+def usage_summary(usage: Any) -> Dict[str, int]:
+    details = getattr(usage, "input_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    }
 
-    resp = client.responses.create(model=MODEL, input=inp)
-    txt = (resp.output_text or "").strip()
+def record_llm_usage(usage: Dict[str, int]):
+    totals = st.session_state.llm_usage
+    for k, v in usage.items():
+        totals[k] = totals.get(k, 0) + v
+    totals["calls"] = totals.get("calls", 0) + 1
+    totals["last"] = usage
+
+# ✅ Structured Outputs: 응답 모양을 JSON 스키마로 강제(코드펜스/형식 오류 방지). 스키마는 고정이라 프롬프트 캐시에도 유리
+COACHING_TEXT_FORMAT = {
+    "format": {
+        "type": "json_schema",
+        "name": "bloomu_coaching",
+        "schema": api_schema(COACHING_SCHEMA),
+        "strict": True,
+    }
+}
+
+
+def call_openai_json(
+    api_key: str,
+    sys_prompt: str,
+    user_prompt: str,
+    chat: List[Dict[str, str]],
+    on_section: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    on_usage: Optional[Callable[[Dict[str, int]], None]] = None,
+    on_truncated: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    client = get_openai_client(api_key)
+    # ✅ 토큰 예산 안에서 최근 대화만, 오래된 코칭 답변은 요약(digest)으로 압축해서 전달
+    context = build_chat_context(chat, CONTEXT_TOKEN_BUDGET)
 
-    if txt.startswith("```"):
-        txt = txt.strip("`")
-        start = txt.find("{")
-        end = txt.rfind("}")
-        txt = txt[start:end + 1] if start != -1 and end != -1 else txt
+    inp = [{"role": "system", "content": sys_prompt}]
+    inp.extend(context)
+    inp.append({"role": "user", "content": user_prompt})
 
-    return json.loads(txt)
+    # ✅ 스트리밍 모드: 최상위 키(empathy_summary → facts → ...)가 완성되는 즉시 on_section 호출
+    if on_section is not None:
+        parser = IncrementalJSONObject()
+        finished = ""
+        incomplete_reason = ""
+        stream = client.responses.create(model=MODEL, input=inp, text=COACHING_TEXT_FORMAT, stream=True)
+        for event in stream:
+            event_type = getattr(event, "type", "")
+            if event_type == "response.output_text.delta":
+                for key in parser.feed(event.delta):
+                    on_section(key, parser.result)
+            elif event_type in ("response.completed", "response.incomplete"):
+                finished = event_type
+                incomplete_reason = getattr(getattr(event.response, "incomplete_details", None), "reason", "") or ""
+                if on_usage is not None:
+                    on_usage(usage_summary(getattr(event.response, "usage", None)))
+            elif event_type == "response.failed":
+                err = getattr(event.response, "error", None)
+                raise AIStreamError(getattr(err, "code", ""), getattr(err, "message", ""))
+            elif event_type == "error":
+                raise AIStreamError(getattr(event, "code", ""), getattr(event, "message", ""))
+
+        # ✅ 잘린 JSON은 서버가 incomplete(토큰 한도 등)로 끝냈을 때만 복구해서 쓴다.
+        if not finished:
+            raise AIStreamError("", "AI 응답 스트림이 중간에 끊겼어요.")
+        if finished == "response.incomplete":
+            if on_truncated is not None:
+                on_truncated(incomplete_reason)
+            return parser.close()
+        if not parser.done:
+            raise ValueError("JSON 응답이 끝까지 도착하지 않았어요.")
+        return parser.result
+
+    resp = client.responses.create(model=MODEL, input=inp, text=COACHING_TEXT_FORMAT)
+    if on_usage is not None:
+        on_usage(usage_summary(getattr(resp, "usage", None)))
+    if getattr(resp, "status", "") == "incomplete" and on_truncated is not None:
+        on_truncated(getattr(getattr(resp, "incomplete_details", None), "reason", "") or "")
+    return parse_json_tolerant(resp.output_text or "")
 
 
 def format_ai_error(err: Exception) -> str:
+    if is_quota_exhausted(err):
+        return (
+            "OpenAI 사용 한도(크레딧)가 모두 소진됐어요(insufficient_quota).\n"
+            "- OpenAI 결제/요금제/사용량 한도를 확인해 주세요.\n"
+            "- 다른 API Key를 사용해 주세요."
+        )
+
     if isinstance(err, RateLimitError) or getattr(err, "status_code", None) == 429:
         return (
-            "AI 호출 한도를 초과했어요(429).\n"
+            "여러 번 다시 시도했지만 AI 호출 한도를 초과했어요(429).\n"
             "- OpenAI 결제/요금제/사용량 한도를 확인해 주세요.\n"
             "- 잠시 후 다시 시도하거나, 다른 API Key를 사용해 주세요."
         )
@@ -351,58 +675,74 @@ def format_ai_error(err: Exception) -> str:
     if isinstance(err, APIConnectionError):
         return "OpenAI 서버 연결에 실패했어요. 네트워크 상태를 확인한 뒤 다시 시도해 주세요."
 
+    if isinstance(err, AIStreamError):
+        return f"AI 응답 생성이 중간에 실패했어요. 잠시 후 다시 시도해 주세요. ({err.code or err})"
+
     return f"AI 응답 처리 실패(형식 오류/네트워크): {err}"
 
 def normalize_and_validate(ai: Dict[str, Any], sources_pool: List[Dict[str, str]], wk: str) -> Dict[str, Any]:
-    out = {
-        "empathy_summary": ai.get("empathy_summary", ""),
-        "facts": [],
-        "strategies": ai.get("strategies", []),
-        "uncertainty_tag": ai.get("uncertainty_tag", "추정(개인화 필요)"),
-        "ab_plans": ai.get("ab_plans", {
-            "A": {"title": "플랜 A", "steps": [], "metrics": ["불안도0~10", "실천도%", "결과물/성과"]},
-            "B": {"title": "플랜 B", "steps": [], "metrics": ["불안도0~10", "실천도%", "결과물/성과"]},
-        }),
-        "weekly_active_plan": ai.get("weekly_active_plan", []),
-        "risk_warning": ai.get("risk_warning", {"is_high_risk": False, "message": "", "safe_actions": []}),
-    }
+    # ✅ 미리 컴파일한 스키마 검증기로 한 번에 모양/타입/enum을 맞춘 뒤, 출처·플랜만 후처리
+    out = validate_coaching(ai)
+
+    pool_urls = {s["url"] for s in SOURCE_ALLOWLIST.filter_allowed(sources_pool or [])}
+    uncertainty_full = {"확실": UNCERTAINTY_OPTIONS[0], "보통": UNCERTAINTY_OPTIONS[1], "추정": UNCERTAINTY_OPTIONS[2]}
+
+    for f in out["facts"]:
+        f["uncertainty"] = uncertainty_full[f["uncertainty"]]
+        f["sources"] = [
+            {"title": s["title"] or s["url"], "url": s["url"]}
+            for s in f["sources"]
+            if is_allowed_url(s["url"]) and (not pool_urls or s["url"] in pool_urls)
+        ]
+
+    # created_at은 행마다 따로 찍는다(정렬 순서 유지, ID는 ensure_task_shape에서 별도로 고유 부여)
+    out["weekly_active_plan"] = [
+        {
+            "week": wk,
+            "day": normalize_day_label(item["day"]),
+            "task": item["task"],
+            "status": item["status"],
+            "created_at": dt.datetime.now().isoformat(),
+        }
+        for item in out["weekly_active_plan"][:24]
+        if item["task"]
+    ]
+    return out
 
-    pool_urls = {s["url"] for s in (sources_pool or []) if is_allowed_url(s.get("url", ""))}
 
-    facts = ai.get("facts", []) or []
-    for f in facts:
-        uncertainty = f.get("uncertainty", "추정")
-        if uncertainty == "확실":
-            uncertainty_full = UNCERTAINTY_OPTIONS[0]
-        elif uncertainty == "보통":
-            uncertainty_full = UNCERTAINTY_OPTIONS[1]
-        else:
-            uncertainty_full = UNCERTAINTY_OPTIONS[2]
-
-        srcs = []
-        for s in (f.get("sources", []) or []):
-            url = s.get("url", "")
-            title = s.get("title", url)
-            if is_allowed_url(url) and (not pool_urls or url in pool_urls):
-                srcs.append({"title": title, "url": url})
-
-        out["facts"].append({"text": f.get("text", ""), "uncertainty": uncertainty_full, "sources": srcs})
-
-    plan = []
-    for item in (out.get("weekly_active_plan") or [])[:24]:
-        day = normalize_day_label(item.get("day") or "")
-        status = (item.get("status") or "진행중").strip()
-        if status not in PLAN_STATUS_OPTIONS:
-            status = "진행중"
-        plan.append({
+# 캐시에서 꺼낸 답변의 주간 플랜을 이번 주/지금 시각으로 다시 찍는다(ID도 새로 부여됨).
+def restamp_cached_answer(ans: Dict[str, Any], wk: str) -> Dict[str, Any]:
+    ans["weekly_active_plan"] = [
+        {
             "week": wk,
-            "day": day,
-            "task": (item.get("task") or "").strip(),
-            "status": status,
+            "day": p.get("day", ""),
+            "task": p.get("task", ""),
+            "status": p.get("status", "진행중"),
             "created_at": dt.datetime.now().isoformat(),
-        })
-    out["weekly_active_plan"] = [p for p in plan if p["task"]]
-    return out
+        }
+        for p in ans.get("weekly_active_plan", [])
+    ]
+    return ans
+
+@st.cache_resource(show_spinner=False)
+def get_answer_cache() -> AnswerCache:
+    return AnswerCache()
+
+
+# ✅ 채팅 턴 단계별 지연 시간(최근 200턴, 프로세스 공용). TRACE_EXPORT_PATH가 있으면 매 턴 파일로 내보냄(.prom/.json)
+@st.cache_resource(show_spinner=False)
+def get_tracer() -> Tracer:
+    return Tracer(maxlen=200)
+
+def record_trace(trace: TurnTrace):
+    tracer = get_tracer()
+    tracer.record(trace)
+    path = st.secrets.get("TRACE_EXPORT_PATH", "")
+    if path:
+        try:
+            tracer.export(path)
+        except OSError:
+            pass
 
 
 # =========================
@@ -417,10 +757,11 @@ def risk_safety_banner_if_needed(user_text: str):
             "- (한국) 자살예방 상담전화 1393\n- 정신건강위기 상담 1577-0199\n- 긴급상황 112/119"
         )
 
-def render_ai_answer(ans: Dict[str, Any], evidence_mode: bool):
+def render_empathy_section(ans: Dict[str, Any], evidence_mode: bool):
     st.markdown("### 1) 공감 & 상황 요약")
     st.write(ans.get("empathy_summary", ""))
 
+def render_facts_section(ans: Dict[str, Any], evidence_mode: bool):
     st.markdown("### 2) 사실(정보)")
     facts = ans.get("facts", [])
     if not facts:
@@ -435,13 +776,16 @@ def render_ai_answer(ans: Dict[str, Any], evidence_mode: bool):
                 for s in srcs[:3]:
                     st.markdown(f"- [{s['title']}]({s['url']})")
 
+def render_strategies_section(ans: Dict[str, Any], evidence_mode: bool):
     st.markdown("### 3) 전략(개인화 조언)")
     for s in ans.get("strategies", [])[:10]:
         st.write(f"- {s}")
 
+def render_uncertainty_section(ans: Dict[str, Any], evidence_mode: bool):
     st.markdown("### 4) 불확실성 태그")
     st.info(ans.get("uncertainty_tag", "추정(개인화 필요)"))
 
+def render_ab_plans_section(ans: Dict[str, Any], evidence_mode: bool):
     st.markdown("### 5) A/B 플랜")
     ab = ans.get("ab_plans", {})
     c1, c2 = st.columns(2)
@@ -458,6 +802,61 @@ def render_ai_answer(ans: Dict[str, Any], evidence_mode: bool):
             st.write(f"- {step}")
         st.caption("측정 지표: " + ", ".join(b.get("metrics") or []))
 
+# JSON 스키마의 최상위 키 → 렌더 함수 (화면 표시 순서)
+ANSWER_SECTIONS = [
+    ("empathy_summary", render_empathy_section),
+    ("facts", render_facts_section),
+    ("strategies", render_strategies_section),
+    ("uncertainty_tag", render_uncertainty_section),
+    ("ab_plans", render_ab_plans_section),
+]
+
+def render_ai_answer(ans: Dict[str, Any], evidence_mode: bool):
+    for _, render_section in ANSWER_SECTIONS:
+        render_section(ans, evidence_mode)
+
+class StreamingAnswerView:
+    # 섹션별 자리(placeholder)를 미리 잡아두고, 완성된 섹션부터 채워 넣는다.
+    def __init__(self, sources_pool: List[Dict[str, str]], wk: str, evidence_mode: bool):
+        self.sources_pool = sources_pool
+        self.wk = wk
+        self.evidence_mode = evidence_mode
+        self.slots = {key: st.empty() for key, _ in ANSWER_SECTIONS}
+        self.rendered = set()
+        self.status = st.empty()
+        self.status.caption("Bloom U가 답변을 작성 중이에요…")
+
+    def on_queue(self, position: int):
+        if position:
+            self.status.info(f"⏳ 지금 요청이 몰려 있어요. 대기 순서: {position}번째")
+        else:
+            self.status.caption("Bloom U가 답변을 작성 중이에요…")
+
+    def on_retry(self, attempt: int, delay: float):
+        # 실패한 시도에서 먼저 그린 섹션은 지우고, 다음 시도 결과로 다시 채운다.
+        for slot in self.slots.values():
+            slot.empty()
+        self.rendered.clear()
+        self.status.info(f"⏳ 요청 한도/일시적 오류로 {delay:.0f}초 뒤 다시 시도할게요. ({attempt}번째 재시도)")
+
+    def on_section(self, key: str, partial: Dict[str, Any]):
+        if key not in self.slots:
+            return
+        ans = normalize_and_validate(partial, self.sources_pool, wk=self.wk)
+        self._render(key, ans)
+
+    def finish(self, ans: Dict[str, Any]):
+        for key, _ in ANSWER_SECTIONS:
+            if key not in self.rendered:
+                self._render(key, ans)
+        self.status.empty()
+
+    def _render(self, key: str, ans: Dict[str, Any]):
+        render_section = dict(ANSWER_SECTIONS)[key]
+        with self.slots[key].container():
+            render_section(ans, self.evidence_mode)
+        self.rendered.add(key)
+
 
 # =========================
 # Notion Export (✅ 1번: 사용자 Notion에 저장)
@@ -467,85 +866,13 @@ def notion_ready() -> bool:
     dbid = (st.session_state.notion.get("db_id") or "").strip()
     return bool(tok) and bool(dbid)
 
-def notion_headers(token: str) -> Dict[str, str]:
-    return {
-        "Authorization": f"Bearer {token}",
-        "Notion-Version": "2022-06-28",
-        "Content-Type": "application/json",
-    }
-
-def _rt(text: str) -> Dict[str, Any]:
-    return {"type": "text", "text": {"content": text}}
-
-def build_week_plan_blocks(week_label: str, wk: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    blocks: List[Dict[str, Any]] = []
-    blocks.append({
-        "object": "block",
-        "type": "heading_2",
-        "heading_2": {"rich_text": [_rt(f"주간 액티브 플랜 · {week_label}")]}
-    })
-    blocks.append({
-        "object": "block",
-        "type": "paragraph",
-        "paragraph": {"rich_text": [_rt(f"WeekKey: {wk}")]}
-    })
-
-    tasks_norm = [ensure_task_shape(t, wk) for t in (tasks or []) if (t.get("task") or "").strip()]
-    for d in DAYS:
-        day_items = [t for t in tasks_norm if t.get("day") == d]
-        if not day_items:
-            continue
-        day_items = sort_tasks_for_day(day_items)
-
-        blocks.append({
-            "object": "block",
-            "type": "heading_3",
-            "heading_3": {"rich_text": [_rt(d)]}
-        })
-        for t in day_items:
-            status = t.get("status", "진행중")
-            icon = "✅" if status == "체크" else ("⏳" if status == "진행중" else "🕒")
-            line = f"{icon} [{status}] {t.get('task','')}"
-            blocks.append({
-                "object": "block",
-                "type": "bulleted_list_item",
-                "bulleted_list_item": {"rich_text": [_rt(line)]}
-            })
-
-    if len(blocks) <= 2:
-        blocks.append({
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {"rich_text": [_rt("이번 주에 저장할 플랜이 없어요.")]},
-        })
-    return blocks[:100]
-
-def notion_create_week_page(token: str, db_id: str, title_prop: str, week_label: str, wk: str, tasks: List[Dict[str, Any]]) -> str:
-    title = f"{week_label} · Bloom U 플랜"
-
-    # ✅ Notion DB마다 Title property 이름이 다를 수 있어서 사용자 입력값(title_prop)을 사용
-    properties = {
-        title_prop: {"title": [_rt(title)]}
-    }
-
-    payload = {
-        "parent": {"database_id": db_id},
-        "properties": properties,
-        "children": build_week_plan_blocks(week_label, wk, tasks),
-    }
-
-    r = requests.post("https://api.notion.com/v1/pages", headers=notion_headers(token), json=payload, timeout=25)
-    if r.status_code >= 300:
-        raise RuntimeError(f"Notion 저장 실패: {r.status_code} - {r.text}")
-
-    return (r.json() or {}).get("url", "")
-
 
 # =========================
 # App UI
 # =========================
 st.set_page_config(page_title=f"{APP_NAME} - 상담/코칭 AI", page_icon="🌸", layout="wide")
 ensure_state()
+ensure_loaded("messages")
 
 # Sidebar
 st.sidebar.title(f"🌸 {APP_NAME}")
@@ -566,6 +893,11 @@ anonymous_mode = st.sidebar.toggle("익명모드", value=st.session_state.settin
 nickname_default = "익명" if anonymous_mode else st.session_state.settings["nickname"] or "user"
 nickname = st.sidebar.text_input("닉네임(챗봇이 이 이름으로 불러요)", value=nickname_default).strip() or "익명"
 
+answer_cache = st.sidebar.toggle(
+    "빠른 답변(비슷한 첫 질문은 저장된 답변 재사용)",
+    value=st.session_state.settings.get("answer_cache", False),
+)
+
 st.session_state.settings.update({
     "tone": tone,
     "level": level,
@@ -573,10 +905,16 @@ st.session_state.settings.update({
     "evidence_mode": evidence_mode,
     "anonymous_mode": anonymous_mode,
     "nickname": nickname,
+    "answer_cache": answer_cache,
 })
 ensure_welcome_message()
 update_core_context_from_settings()
 
+# ✅ 선택한 분야의 근거 검색을 백그라운드로 미리 받아 둔다(분야를 바꿀 때만 새로 요청, 이미 있으면 no-op)
+if evidence_mode and st.secrets.get("SERPER_API_KEY", ""):
+    init_search_cache()
+    prefetch_domain(domain, st.secrets["SERPER_API_KEY"])
+
 tab = st.sidebar.radio(
     "탭",
     [
@@ -590,6 +928,30 @@ tab = st.sidebar.radio(
     ],
     index=0
 )
+ensure_loaded(*TAB_COLLECTIONS.get(tab, []))
+
+usage = st.session_state.llm_usage
+if usage.get("calls"):
+    cached_pct = round(100 * usage.get("cached_tokens", 0) / max(1, usage.get("input_tokens", 0)), 1)
+    st.sidebar.caption(
+        f"토큰 사용량: 입력 {usage['input_tokens']:,} (캐시 {usage.get('cached_tokens', 0):,} · {cached_pct}%) · "
+        f"출력 {usage['output_tokens']:,} / {usage['calls']}회"
+    )
+
+if st.sidebar.toggle("디버그: 단계별 응답 시간", value=False):
+    tracer = get_tracer()
+    latency = tracer.summary()
+    if latency:
+        st.sidebar.dataframe(pd.DataFrame(latency).T[["count", "p50_ms", "p95_ms", "max_ms"]], use_container_width=True)
+        st.sidebar.json(tracer.recent(1)[-1], expanded=False)
+        st.sidebar.download_button("trace 내보내기(JSON)", tracer.to_json(), file_name="bloomu_traces.json")
+    else:
+        st.sidebar.caption("아직 기록된 채팅 턴이 없어요.")
+    cache_stats = search_cache_stats()
+    st.sidebar.caption(
+        f"검색 캐시: 적중 {cache_stats['hits']:,} (디스크 {cache_stats['disk_hits']:,}) · "
+        f"미스 {cache_stats['misses']:,} · 보관 {cache_stats['size']:,}개"
+    )
 
 st.sidebar.divider()
 st.sidebar.caption(f"타겟 사용자: {TARGET}")
@@ -620,6 +982,18 @@ if notion_ready():
 else:
     st.sidebar.info("Notion 저장 기능을 쓰려면 토큰 + DB ID가 필요해요.")
 
+# ✅ 기록 코드: 저장소(BLOOMU_DB_PATH)를 쓸 때만. 코드를 아는 사람만 기록을 불러올 수 있다.
+if get_storage() is not None:
+    get_user_id()
+    with st.sidebar.expander("🔑 내 기록 코드", expanded=False):
+        st.caption("새로고침하거나 다른 기기에서 이 코드를 입력하면 내 기록을 불러올 수 있어요. 링크에는 남지 않으니 따로 안전하게 보관해 주세요.")
+        st.code(st.session_state.restore_code, language=None)
+        restore_input = st.text_input("보관한 기록 코드 입력", type="password")
+        if st.button("내 기록 불러오기", use_container_width=True, disabled=not restore_input.strip()):
+            st.session_state.clear()
+            use_restore_code(restore_input.strip())
+            st.rerun()
+
 # Header
 st.title(f"🌸 {APP_NAME}")
 st.markdown(f"**{SLOGAN}**")
@@ -665,9 +1039,11 @@ if tab == "채팅":
     if not user and st.session_state.last_ai_answer and not rendered_rich_answer:
         render_recent_answer()
     if user:
+        trace = TurnTrace()
         wk = week_key()
         update_streak_and_badges()
         st.session_state.messages.append({"role": "user", "content": user})
+        persist_message(st.session_state.messages[-1])
         update_core_context_from_chat(user, wk)
         with st.chat_message("user"):
             st.markdown(user)
@@ -679,25 +1055,6 @@ if tab == "채팅":
                 st.error("사이드바에 OpenAI API Key를 넣어야 해요.")
             st.stop()
 
-        # Evidence pool
-        sources_pool = []
-        if evidence_mode:
-            serper_key = st.secrets.get("SERPER_API_KEY", "")
-            if serper_key:
-                try:
-                    q = f"{domain} 대학생 {user}"
-                    sources_pool = serper_search(q, serper_key, k=5)
-                except Exception:
-                    sources_pool = curated_sources(domain)
-            else:
-                sources_pool = curated_sources(domain)
-
-        sources_block = ""
-        if evidence_mode and sources_pool:
-            sources_block = "SOURCES(공식/기관 링크):\n" + "\n".join(
-                [f"- {s['title']} | {s['url']}" for s in sources_pool[:5]]
-            )
-
         survey = st.session_state.survey.get(wk)
         metrics = st.session_state.ab_metrics.get(wk)
         core = get_week_core_context(wk)
@@ -724,23 +1081,92 @@ if tab == "채팅":
         if core.get("constraints"):
             personal_context.append(f"[제약/조건] {core.get('constraints')}")
 
-        user_prompt = (
-            f"{sources_block}\n\n"
-            + ("\n".join(personal_context) + "\n\n" if personal_context else "")
-            + f"사용자 메시지:\n{user}"
-        )
+        # ✅ (선택) 비슷한 첫 질문이면 저장된 답변을 바로 재사용 — 이전 대화가 없고 고위험 주제가 아닐 때만
+        cache_bucket = ""
+        cached = None
+        first_turn = sum(1 for m in st.session_state.messages if m.get("role") == "user") == 1
+        if st.session_state.settings.get("answer_cache") and first_turn and not detect_high_risk(user):
+            cache_bucket = answer_cache_bucket(st.session_state.settings, extract_core_signals(user), personal_context)
+            cached = get_answer_cache().lookup(cache_bucket, user)
+
+        # Evidence pool (✅ 캐시에서 답을 찾지 못했을 때만 검색 시작 → 백그라운드로 돌리고 그동안 프롬프트 조립)
+        lookup = None
+        lookup_started = time.monotonic()
+        if evidence_mode and cached is None:
+            init_evidence_index()
+            serper_key = st.secrets.get("SERPER_API_KEY", "")
+            if serper_key:
+                init_search_cache()
+                # 초과 요청 + site: 필터 검색을 병렬로 돌리고, 로컬 색인/분야 프리패치/큐레이션과 RRF로 합친다.
+                lookup = start_hybrid_lookup(f"{domain} 대학생 {user}", domain, serper_key, k=5, local_query=user)
 
         # ✅ tone option이 실제 말투에 반영되도록 system prompt에 강제 주입됨(build_system_prompt)
-        sys_prompt = build_system_prompt(st.session_state.settings)
+        with trace.stage("prompt_build"):
+            sys_prompt = build_system_prompt(st.session_state.settings)
+
+        sources_pool = []
+        if cached is not None:
+            sources_pool = cached.get("sources", [])
+            trace.meta["answer_cache"] = "hit"
+        elif evidence_mode:
+            with trace.stage("evidence"):
+                budget = max(0.0, EVIDENCE_BUDGET_S - (time.monotonic() - lookup_started))
+                sources_pool = resolve_sources(lookup, domain, budget, query=user)
+
+        with trace.stage("prompt_build"):
+            sources_block = ""
+            if evidence_mode and sources_pool:
+                sources_block = "SOURCES(공식/기관 링크):\n" + "\n".join(
+                    [f"- {s['title']} | {s['url']}" for s in sources_pool[:5]]
+                )
+
+            user_prompt = (
+                f"{sources_block}\n\n"
+                + ("\n".join(personal_context) + "\n\n" if personal_context else "")
+                + f"사용자 메시지:\n{user}"
+            )
 
         with st.chat_message("assistant"):
-            try:
-                with st.spinner("Bloom U가 대화를 준비중이에요"):
-                    ai_json = call_openai_json(api_key, sys_prompt, user_prompt, st.session_state.messages)
-                    ans = normalize_and_validate(ai_json, sources_pool, wk=wk)
-            except Exception as e:
-                st.error(format_ai_error(e))
-                st.stop()
+            view = None
+            if cached is not None:
+                ans = restamp_cached_answer(cached["answer"], wk)
+                st.caption("⚡ 비슷한 질문에 대한 답변을 바로 불러왔어요.")
+            else:
+                view = StreamingAnswerView(sources_pool, wk, evidence_mode)
+                try:
+                    # 이번 사용자 메시지는 user_prompt에 이미 들어 있으므로 대화 기록에서는 제외
+                    # ✅ 키별 대기열에서 차례를 기다린 뒤 호출(429는 백오프 후 자동 재시도)
+                    # 재시도 중 앞선 시도의 사용량이 보고돼도 중복 집계하지 않도록, 성공한 시도의 값만 1번 기록
+                    turn_usage: Dict[str, Dict[str, int]] = {}
+                    truncated: List[str] = []
+                    with trace.stage("call"):
+                        ai_json = get_key_scheduler(api_key_hash(api_key)).run(
+                            lambda: call_openai_json(
+                                api_key, sys_prompt, user_prompt, st.session_state.messages[:-1],
+                                on_section=view.on_section,
+                                on_usage=lambda usage: turn_usage.update(last=usage),
+                                on_truncated=truncated.append,
+                            ),
+                            should_retry=is_retryable_ai_error,
+                            on_wait=view.on_queue,
+                            on_retry=view.on_retry,
+                        )
+                    if turn_usage:
+                        record_llm_usage(turn_usage["last"])
+                    with trace.stage("normalize"):
+                        ans = normalize_and_validate(ai_json, sources_pool, wk=wk)
+                    if truncated:
+                        trace.meta["truncated"] = truncated[-1] or "incomplete"
+                        st.caption("⚠️ 답변이 길이 한도로 중간에 잘려서, 받은 부분까지만 보여드려요.")
+                except Exception as e:
+                    trace.meta["error"] = type(e).__name__
+                    record_trace(trace)
+                    view.status.empty()
+                    st.error(format_ai_error(e))
+                    st.stop()
+                # 잘린 답변을 복구한 결과는 캐시하지 않는다(다음 사람에게 불완전한 답이 재사용되지 않도록).
+                if cache_bucket and not truncated:
+                    get_answer_cache().store(cache_bucket, user, {"answer": ans, "sources": sources_pool})
 
             st.session_state.last_ai_answer = ans
             st.session_state.last_evidence_mode = evidence_mode
@@ -752,12 +1178,26 @@ if tab == "채팅":
             st.session_state.active_plan["planB"] = (ans.get("ab_plans", {}).get("B", {}) or {}).get("steps", []) or []
 
             # ✅✅✅ 핵심 수정: 이번 주 생성 플랜을 덮어쓰기 대신 "누적" 저장
-            existing_tasks = st.session_state.plan_by_week.get(wk, []) or []
-            new_tasks = [ensure_task_shape(t, wk) for t in ans.get("weekly_active_plan", [])]
-            st.session_state.plan_by_week[wk] = merge_weekly_plan(existing_tasks, new_tasks, wk)
-            update_core_context_from_plan(wk, st.session_state.plan_by_week[wk])
-
-            render_ai_answer(ans, evidence_mode)
+            with trace.stage("merge"):
+                existing_tasks = st.session_state.plan_by_week.get(wk, []) or []
+                new_tasks = [ensure_task_shape(t, wk) for t in ans.get("weekly_active_plan", [])]
+                st.session_state.plan_by_week.replace_week(wk, merge_weekly_plan(existing_tasks, new_tasks, wk))
+                existing_keys = {task_row_key(t) for t in existing_tasks}
+                merged_keys = set()
+                for t in st.session_state.plan_by_week.get(wk):
+                    merged_keys.add(task_row_key(t))
+                    if task_row_key(t) not in existing_keys:
+                        persist_task(t)
+                # ✅ merge에서 빠진 기존 액션(요일 없음 등)은 DB에서도 지워야 다음 로드 때 되살아나지 않는다.
+                for key in existing_keys - merged_keys:
+                    unpersist("task", key)
+                update_core_context_from_plan(wk, st.session_state.plan_by_week.get(wk))
+
+            with trace.stage("render"):
+                if view is not None:
+                    view.finish(ans)
+                else:
+                    render_ai_answer(ans, evidence_mode)
 
             summary_md = (
                 f"**공감 & 요약**\n{ans.get('empathy_summary','')}\n\n"
@@ -772,8 +1212,11 @@ if tab == "채팅":
                 "evidence_mode": evidence_mode,
                 "sources": sources_pool,
             })
+            persist_message(st.session_state.messages[-1])
 
-        unlock_badges()
+        with trace.stage("unlock_badges"):
+            unlock_badges()
+        record_trace(trace)
 
 
 # =========================
@@ -800,7 +1243,7 @@ elif tab == "주간 액티브 플랜":
     st.write(f"주차: **{label}**  (키: {chosen_wk})")
 
     st.markdown("### 📤 Notion으로 내보내기")
-    st.caption("선택한 주차의 플랜을 사용자의 Notion Database에 ‘페이지 1개’로 저장합니다.")
+    st.caption("선택한 주차의 플랜을 사용자의 Notion Database에 ‘페이지 1개’로 저장합니다. 다시 저장하면 바뀐 액션만 반영돼요.")
     exp_col1, exp_col2 = st.columns([0.60, 0.40])
     with exp_col1:
         st.info("Notion DB에 Integration을 Share 했는지 확인해요. Share가 없으면 저장이 실패해요.")
@@ -811,13 +1254,60 @@ elif tab == "주간 액티브 플랜":
                 dbid = st.session_state.notion["db_id"].strip()
                 title_prop = st.session_state.notion["title_prop"].strip() or "Name"
                 tasks = st.session_state.plan_by_week.get(chosen_wk, []) or []
-                page_url = notion_create_week_page(tok, dbid, title_prop, label, chosen_wk, tasks)
-                st.success("Notion 저장 완료 ✅")
-                if page_url:
-                    st.markdown(f"- 저장된 페이지: {page_url}")
+                record = st.session_state.notion_sync.setdefault(dbid, {}).setdefault(chosen_wk, {})
+                try:
+                    stats = notion_sync_week(tok, dbid, title_prop, label, chosen_wk, tasks, record)
+                finally:
+                    if record:
+                        persist("notion_sync", f"{dbid}|{chosen_wk}", record)
+                if stats["created"]:
+                    st.success("Notion 저장 완료 ✅")
+                else:
+                    st.success(
+                        f"Notion 동기화 완료 ✅ (변경 {stats['updated']} · 추가 {stats['added']} · 삭제 {stats['removed']})"
+                    )
+                if record.get("url"):
+                    st.markdown(f"- 저장된 페이지: {record['url']}")
             except Exception as e:
                 st.error(f"Notion 저장 실패: {e}")
 
+    # ✅ 여러 주차 일괄 저장(병렬 + Notion 속도 제한 준수). 단건 저장과 같은 notion_sync 기록을 써서
+    #    이미 저장된 주차는 바뀐 액션만 반영하고, 실패 시 다시 누르면 남은 부분부터 이어서 저장
+    with st.expander("여러 주차 한 번에 저장", expanded=False):
+        if len(all_weeks) > 1:
+            bulk_range = st.select_slider("저장할 주차 범위", options=all_weeks, value=(all_weeks[0], all_weeks[-1]))
+        else:
+            bulk_range = (all_weeks[0], all_weeks[0])
+        bulk_weeks = [w for w in all_weeks if bulk_range[0] <= w <= bulk_range[1]]
+        dbid = st.session_state.notion["db_id"].strip()
+        records = st.session_state.notion_sync.setdefault(dbid, {})
+        already = [w for w in bulk_weeks if (records.get(w) or {}).get("page_id")]
+        if already:
+            st.caption(f"이미 저장된 {len(already)}개 주차는 바뀐 액션만 반영해요.")
+        if st.button("선택 범위 일괄 저장", use_container_width=True, disabled=not notion_ready()):
+            weeks_payload = [
+                (w, week_label_yy_mm_ww_from_week_start(week_start_from_key(w)), st.session_state.plan_by_week.get(w, []) or [])
+                for w in bulk_weeks
+            ]
+            with st.spinner("Notion에 저장 중이에요"):
+                try:
+                    errors = notion_export_weeks(
+                        st.session_state.notion["token"].strip(),
+                        dbid,
+                        st.session_state.notion["title_prop"].strip() or "Name",
+                        weeks_payload,
+                        records,
+                    )
+                finally:
+                    # 실패한 주차도 만들던 페이지 정보를 남겨야 다음에 중복 페이지가 생기지 않는다.
+                    for w in bulk_weeks:
+                        if records.get(w):
+                            persist("notion_sync", f"{dbid}|{w}", records[w])
+            saved = [w for w in bulk_weeks if (records.get(w) or {}).get("page_id")]
+            st.success(f"{len(saved)}/{len(bulk_weeks)}개 주차 저장 완료 ✅")
+            for w, err in errors.items():
+                st.error(f"{w}: {err} (다시 누르면 이어서 저장해요)")
+
     st.divider()
 
     # Filters
@@ -839,9 +1329,7 @@ elif tab == "주간 액티브 플랜":
 
     st.divider()
 
-    tasks = st.session_state.plan_by_week.get(chosen_wk, []) or []
-    tasks = [ensure_task_shape(t, chosen_wk) for t in tasks if (t.get("task") or "").strip()]
-    st.session_state.plan_by_week[chosen_wk] = tasks
+    store = st.session_state.plan_by_week
 
     st.markdown("### 달력 보기 (요일별)")
     st.caption("체크박스와 상태 선택은 서로 연동됩니다. / 상태 선택 = 체크·진행중·미루기 / ‘미루기’ 선택 시 자동으로 다음 요일(또는 다음 주)로 이동")
@@ -849,8 +1337,7 @@ elif tab == "주간 액티브 플랜":
     cols = st.columns(7)
 
     def get_day_items(day_label: str) -> List[Dict[str, Any]]:
-        items = [t for t in st.session_state.plan_by_week.get(chosen_wk, []) if t.get("day") == day_label]
-        items = [t for t in items if t.get("status") in status_filter]
+        items = [t for t in store.day_items(chosen_wk, day_label) if t.get("status") in status_filter]
         if not show_hidden:
             items = [t for t in items if not t.get("hidden")]
         if show_sort:
@@ -881,9 +1368,9 @@ elif tab == "주간 액티브 플랜":
                 st.caption("—")
                 continue
 
-            for j, item in enumerate(day_items):
-                uid = task_uid(item["task"], item.get("day", ""), item.get("week", chosen_wk))
-                base_key = f"cal_{uid}_{j}"
+            for item in day_items:
+                tid = item["id"]
+                base_key = f"cal_{tid}"
 
                 prev_hidden = bool(item.get("hidden"))
                 hidden_now = st.checkbox(
@@ -894,6 +1381,7 @@ elif tab == "주간 액티브 플랜":
                 )
                 if hidden_now != prev_hidden:
                     item["hidden"] = hidden_now
+                    persist_task(item)
                     if hidden_now and not show_hidden:
                         st.rerun()
 
@@ -915,47 +1403,32 @@ elif tab == "주간 액티브 플랜":
 
                 prev_status = item["status"]
                 checkbox_was_checked = (prev_status == "체크")
+                new_status = prev_status
 
                 # 상태 선택값이 바뀌면 체크박스도 자동 반영
                 if selected_status != prev_status:
-                    item["status"] = selected_status
+                    new_status = selected_status
 
                 # 체크박스 토글이 바뀌면 상태도 자동 반영
                 if checked_now != checkbox_was_checked:
                     if checked_now:
-                        item["status"] = "체크"
-                    elif item["status"] == "체크":
-                        item["status"] = "진행중"
+                        new_status = "체크"
+                    elif new_status == "체크":
+                        new_status = "진행중"
+
+                store.set_status(tid, new_status)
 
                 # Auto-reschedule when switched to '미루기'
                 if item["status"] == "미루기" and prev_status != "미루기":
-                    cur_list = st.session_state.plan_by_week.get(chosen_wk, []) or []
-
-                    removed = False
-                    for idx in range(len(cur_list) - 1, -1, -1):
-                        t = cur_list[idx]
-                        if t.get("task") == item.get("task") and t.get("day") == item.get("day") and t.get("created_at") == item.get("created_at"):
-                            cur_list.pop(idx)
-                            removed = True
-                            break
-                    if not removed:
-                        for idx in range(len(cur_list) - 1, -1, -1):
-                            t = cur_list[idx]
-                            if t.get("task") == item.get("task") and t.get("day") == item.get("day"):
-                                cur_list.pop(idx)
-                                break
-
-                    st.session_state.plan_by_week[chosen_wk] = cur_list
-
-                    moved = dict(item)
-                    moved = move_task_to_next_slot(moved)
-
-                    target_wk = moved.get("week", chosen_wk)
-                    st.session_state.plan_by_week.setdefault(target_wk, [])
-                    st.session_state.plan_by_week[target_wk].append(moved)
+                    target = move_task_to_next_slot(dict(item))
+                    store.move(tid, target.get("week", chosen_wk), target.get("day", ""))
+                    persist_task(item)
 
                     st.rerun()
 
+                if item["status"] != prev_status:
+                    persist_task(item)
+
                 badge = "✅" if item["status"] == "체크" else ("⏳" if item["status"] == "진행중" else "🕒")
                 st.write(f"{badge} {item['task']}")
 
@@ -991,8 +1464,8 @@ elif tab == "주간 액티브 플랜":
                 "status": new_status,
                 "created_at": dt.datetime.now().isoformat(),
             }
-            st.session_state.plan_by_week.setdefault(chosen_wk, [])
-            st.session_state.plan_by_week[chosen_wk].append(t)
+            t = st.session_state.plan_by_week.add(t, chosen_wk)
+            persist_task(t)
             st.success("추가했어요!")
             unlock_badges()
             st.rerun()
@@ -1012,6 +1485,7 @@ elif tab == "전략 A/B 측정":
             "A": {"anxiety": 5, "execution": 50, "outcome": "", "notes": ""},
             "B": {"anxiety": 5, "execution": 50, "outcome": "", "notes": ""},
         }
+        st.session_state.dashboard_cache.invalidate(wk)
 
     # 입력 UI
     for plan_id in ["A", "B"]:
@@ -1047,6 +1521,8 @@ elif tab == "전략 A/B 측정":
             "outcome": st.session_state.get(f"ab_out_{wk}_B", ""),
             "notes": st.session_state.get(f"ab_note_{wk}_B", ""),
         }
+        persist("ab_metrics", wk, st.session_state.ab_metrics[wk])
+        st.session_state.dashboard_cache.invalidate(wk)
         update_core_context_from_ab_metrics(wk, st.session_state.ab_metrics[wk])
         st.success("저장됨! 다음에 ‘채팅’에서는 답변을 더 개인맞춤형으로 해드릴게요.")
 
@@ -1093,6 +1569,8 @@ elif tab == "주간 자가설문":
             "notes": notes.strip(),
             "saved_at": dt.datetime.now().isoformat(),
         }
+        persist("survey", wk, st.session_state.survey[wk])
+        st.session_state.dashboard_cache.invalidate(wk)
         update_core_context_from_survey(wk, st.session_state.survey[wk])
         unlock_badges()
         st.success("저장 완료! 주간 리포트/대시보드에 반영돼요.")
@@ -1104,37 +1582,20 @@ elif tab == "주간 자가설문":
 elif tab == "주간 리포트/성장 대시보드":
     st.subheader("📊 주간 레포트 & 성장 시각화 대시보드")
 
-    weeks = sorted(set(list(st.session_state.survey.keys()) + list(st.session_state.ab_metrics.keys()) + list(st.session_state.plan_by_week.keys())))
+    weeks = dashboard_weeks()
     if not weeks:
         st.info("아직 데이터가 없어요. 주간 설문을 저장하거나 전략 A/B 맞춤 측정을 해보세요.")
         st.stop()
 
-    rows = []
-    for wk in weeks:
-        core = get_week_core_context(wk)
-        s = st.session_state.survey.get(wk, {}) or core.get("survey", {})
-        m = st.session_state.ab_metrics.get(wk, {}) or core.get("ab_metrics", {})
-        tasks = st.session_state.plan_by_week.get(wk, []) or []
+    store = st.session_state.plan_by_week
 
-        completion = None
-        if tasks:
-            completion = round(100 * sum(1 for t in tasks if t.get("status") == "체크") / len(tasks), 1)
-        update_core_context_from_plan(wk, tasks)
+    def dashboard_row(wk: str) -> Dict[str, Any]:
+        update_core_context_from_plan(wk)
+        return build_week_row(*dashboard_row_inputs(wk))
 
-        rows.append({
-            "week": wk,
-            "confidence": s.get("confidence"),
-            "anxiety": s.get("anxiety"),
-            "energy": s.get("energy"),
-            "plan_completion_%": completion,
-            "A_anxiety": (m.get("A") or {}).get("anxiety"),
-            "A_execution_%": (m.get("A") or {}).get("execution"),
-            "B_anxiety": (m.get("B") or {}).get("anxiety"),
-            "B_execution_%": (m.get("B") or {}).get("execution"),
-            "notes": s.get("notes", ""),
-        })
-
-    df = pd.DataFrame(rows).sort_values("week")
+    # ✅ 바뀐 주차만 다시 계산(설문/A/B 저장 시 invalidate, 플랜은 PlanStore version으로 감지)
+    # 백그라운드에서 미리 채워 둔 주차는 캐시에서 바로 꺼내 쓴다.
+    df = st.session_state.dashboard_cache.frame(weeks, dashboard_row, store.version)
     st.dataframe(df, use_container_width=True)
 
     c1, c2 = st.columns(2)
@@ -1170,7 +1631,7 @@ elif tab == "데일리 패턴 체크":
 
     # ✅ 안전 초기화
     if "daily_patterns" not in st.session_state:
-        st.session_state.daily_patterns = {}
+        st.session_state.daily_patterns = DailyPatternColumns()
 
     st.subheader("📊 데일리 패턴 체크")
 
@@ -1193,16 +1654,18 @@ elif tab == "데일리 패턴 체크":
 
     st.markdown("### ✅ 오늘 체크")
 
-    water = st.slider("💧 수분 섭취", 1, 5, cur["water"])
-    exercise = st.slider("🏃 운동량", 1, 5, cur["exercise"])
-    sleep = st.slider("😴 수면 만족도", 1, 5, cur["sleep"])
-    condition = st.slider("🙂 컨디션", 1, 5, cur["condition"])
-    custom = st.slider("⭐ 개인 목표", 1, 5, cur["custom"])
+    water = st.slider("💧 수분 섭취", 1, 5, cur["water"] or 3)
+    exercise = st.slider("🏃 운동량", 1, 5, cur["exercise"] or 3)
+    sleep = st.slider("😴 수면 만족도", 1, 5, cur["sleep"] or 3)
+    condition = st.slider("🙂 컨디션", 1, 5, cur["condition"] or 3)
+    custom = st.slider("⭐ 개인 목표", 1, 5, cur["custom"] or 3)
 
     memo = st.text_area("📝 메모", value=cur["memo"])
 
     if st.button("💾 오늘 기록 저장", use_container_width=True):
 
+        rollup = get_daily_rollup()  # 새 기록을 넣기 전에 만들어야 중복 집계가 없다.
+        prev_record = st.session_state.daily_patterns.get(today_str)
         st.session_state.daily_patterns[today_str] = {
             "water": water,
             "exercise": exercise,
@@ -1212,6 +1675,8 @@ elif tab == "데일리 패턴 체크":
             "memo": memo,
             "saved_at": dt.datetime.now().isoformat()
         }
+        persist("daily", today_str, st.session_state.daily_patterns[today_str])
+        rollup.apply(today_str, prev_record, st.session_state.daily_patterns[today_str])
 
         st.success("오늘 패턴이 저장됐어요! ✅")
 
@@ -1225,26 +1690,28 @@ elif tab == "데일리 패턴 체크":
     if not st.session_state.daily_patterns:
         st.info("아직 저장된 기록이 없어요.")
     else:
-        df = pd.DataFrame.from_dict(
-            st.session_state.daily_patterns,
-            orient="index"
-        )
-
-        df.index = pd.to_datetime(df.index)
-
-        # 월간 평균
-        monthly = df.resample("M").mean(numeric_only=True)
-
-        # 연간 평균
-        yearly = df.resample("Y").mean(numeric_only=True)
+        # ✅ 백그라운드에서 미리 만든 월/연 평균 표가 있으면 사용, 없으면 지금 계산
+        tables = preloaded("daily")
+        if tables is None:
+            rollup = get_daily_rollup()
+            tables = {
+                "monthly": rollup.monthly_frame().round(2),  # 월간 평균
+                "yearly": rollup.yearly_frame().round(2),  # 연간 평균
+            }
 
         st.markdown("#### 📅 월간 평균")
-        st.dataframe(monthly.round(2), use_container_width=True)
+        st.dataframe(tables["monthly"], use_container_width=True)
 
         st.markdown("#### 📆 연간 평균")
-        st.dataframe(yearly.round(2), use_container_width=True)
+        st.dataframe(tables["yearly"], use_container_width=True)
 
         st.markdown("#### 📊 추이 그래프")
-        st.line_chart(
-            df[["water", "exercise", "sleep", "condition", "custom"]]
-        )
+        # 전체 일별 데이터는 그래프를 펼칠 때만 만든다.
+        if st.toggle("추이 그래프 보기", value=False):
+            st.line_chart(st.session_state.daily_patterns.to_frame())
+
+
+# =========================
+# Background preload (다음 탭 준비)
+# =========================
+schedule_preloads()
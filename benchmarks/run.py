@@ -0,0 +1,144 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+from bloomu.constants import CONTEXT_TOKEN_BUDGET
+from bloomu.context import build_chat_context
+from bloomu.dashboard import DashboardCache, build_week_row
+from bloomu.daily import DailyPatternColumns, DailyRollup
+from bloomu.helpers import (
+    detect_high_risk,
+    ensure_task_shape,
+    extract_core_signals,
+    merge_weekly_plan,
+    sort_tasks_for_day,
+)
+from bloomu.plan_store import PlanStore
+from bloomu.risk import RISK_MATCHER
+
+from .synthetic import make_daily_records, make_messages, make_surveys, make_tasks, make_weeks
+
+# 사용법(저장소 루트에서):
+#   python -m benchmarks.run --out bench.json
+#   python -m benchmarks.run --out new.json --baseline bench.json --threshold 1.2
+# baseline 대비 중앙값이 threshold배 이상 느려진 항목이 있으면 종료 코드 1
+
+
+def measure(fn: Callable[[], Any], repeat: int, number: int) -> Dict[str, float]:
+    fn()  # warm-up
+    runs = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - t) / number * 1000)
+    return {
+        "median_ms": round(statistics.median(runs), 4),
+        "min_ms": round(min(runs), 4),
+        "max_ms": round(max(runs), 4),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    tasks = make_tasks()
+    records = make_daily_records()
+    messages = make_messages()
+    user_texts = [m["content"] for m in messages if m["role"] == "user"]
+    weeks = make_weeks(156)
+    surveys = make_surveys(weeks)
+
+    shaped = [ensure_task_shape(t, t["week"]) for t in tasks]
+    by_week: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for t in shaped:
+        by_week[t["week"]].append(t)
+    busiest = max(by_week, key=lambda wk: len(by_week[wk]))
+    existing, incoming = by_week[busiest], [dict(t, id="") for t in by_week[busiest][::2]]
+    store = PlanStore.from_dict(by_week)
+    columns = DailyPatternColumns.from_records(records)
+
+    def dashboard_rows():
+        return [build_week_row(wk, surveys[wk], {}, store.count(wk), store.count(wk, "체크")) for wk in weeks]
+
+    def dashboard_frame_cold():
+        return DashboardCache().frame(weeks, lambda wk: build_week_row(wk, surveys[wk], {}, store.count(wk), store.count(wk, "체크")), store.version)
+
+    def daily_resample():
+        df = columns.to_frame()
+        return df.resample("W").mean(), df.resample("MS").mean(), df.resample("YS").mean()
+
+    return {
+        "ensure_task_shape[10k]": lambda: [ensure_task_shape(t, t["week"]) for t in tasks],
+        "merge_weekly_plan[busiest_week]": lambda: merge_weekly_plan(existing, incoming, busiest),
+        "sort_tasks_for_day[10k]": lambda: sort_tasks_for_day(shaped),
+        "detect_high_risk[250_msgs]": lambda: [detect_high_risk(x) for x in user_texts],
+        "risk_scan_history[500_msgs]": lambda: RISK_MATCHER.scan_history(messages),
+        "extract_core_signals[250_msgs]": lambda: [extract_core_signals(x) for x in user_texts],
+        "build_chat_context[500_msgs]": lambda: build_chat_context(messages, CONTEXT_TOKEN_BUDGET),
+        "plan_store_from_dict[10k]": lambda: PlanStore.from_dict(by_week),
+        "dashboard_rows[156_weeks]": dashboard_rows,
+        "dashboard_frame_cold[156_weeks]": dashboard_frame_cold,
+        "daily_columns_from_records[3y]": lambda: DailyPatternColumns.from_records(records),
+        "daily_rollup_from_records[3y]": lambda: DailyRollup.from_records(records).monthly_frame(),
+        "daily_resample[3y]": daily_resample,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    base = baseline.get("results", {})
+    for name, r in results.items():
+        if name not in base:
+            continue
+        ratio = r["median_ms"] / max(base[name]["median_ms"], 1e-9)
+        flag = "REGRESSION" if ratio >= threshold else ""
+        print(f"  {name:<36} {base[name]['median_ms']:>10.3f} → {r['median_ms']:>10.3f} ms  x{ratio:.2f} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bloom U helper/plan/dashboard benchmarks")
+    parser.add_argument("--out", default="benchmarks/results.json")
+    parser.add_argument("--baseline", default="")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--number", type=int, default=3)
+    parser.add_argument("--only", default="", help="이름에 이 문자열이 들어간 항목만 실행")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, fn in build_cases().items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(fn, args.repeat, args.number)
+        print(f"{name:<38} {results[name]['median_ms']:>10.3f} ms")
+
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    print(f"saved → {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"baseline: {args.baseline}")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import datetime as dt
+import random
+from typing import Any, Dict, List
+
+from bloomu.constants import DAILY_METRICS, DAYS, PLAN_STATUS_OPTIONS
+from bloomu.helpers import week_key
+
+# 벤치마크용 합성 데이터. seed가 같으면 항상 같은 데이터가 나온다(재현 가능).
+
+TASK_WORDS = ["토익", "과제", "면접", "운동", "독서", "코딩", "발표", "정리", "복습", "지원서", "산책", "명상"]
+CHAT_LINES = [
+    "목표: 이번 학기 학점 3.8 이상",
+    "현재: 전공 수업 5개, 알바 주 2회",
+    "제약: 평일 저녁만 시간이 있어요",
+    "처음으로 인턴 지원을 해보려는데 뭐부터 해야 할지 모르겠어요.",
+    "요즘 잠을 잘 못 자고 불안해요.",
+    "주식 투자를 시작해볼까 고민 중이에요.",
+    "자취를 처음 시작했는데 생활비 관리가 어려워요.",
+    "동아리 발표를 맡았는데 떨려요.",
+]
+
+
+def make_weeks(n: int, start: dt.date = dt.date(2023, 1, 2)) -> List[str]:
+    return [week_key(start + dt.timedelta(weeks=i)) for i in range(n)]
+
+
+def make_tasks(n: int = 10_000, n_weeks: int = 156, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    weeks = make_weeks(n_weeks)
+    base = dt.datetime(2023, 1, 2, 9, 0)
+    tasks = []
+    for i in range(n):
+        tasks.append({
+            "week": rng.choice(weeks),
+            "day": rng.choice(DAYS + [""]),
+            "task": f"{rng.choice(TASK_WORDS)} {rng.choice(TASK_WORDS)} {i % 500}",
+            "status": rng.choice(PLAN_STATUS_OPTIONS),
+            "created_at": (base + dt.timedelta(minutes=i * 37)).isoformat(),
+        })
+    return tasks
+
+
+def make_daily_records(years: int = 3, seed: int = 7) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    start = dt.date(2023, 1, 1)
+    records = {}
+    for i in range(365 * years):
+        day = (start + dt.timedelta(days=i)).isoformat()
+        rec: Dict[str, Any] = {m: rng.randint(1, 5) for m in DAILY_METRICS}
+        rec["memo"] = ""
+        records[day] = rec
+    return records
+
+
+def make_messages(n: int = 500, seed: int = 7) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    messages = []
+    for i in range(n):
+        if i % 2 == 0:
+            lines = rng.sample(CHAT_LINES, k=rng.randint(1, 4))
+            messages.append({"role": "user", "content": "\n".join(lines)})
+        else:
+            messages.append({"role": "assistant", "content": "**공감 & 요약**\n" + rng.choice(CHAT_LINES) * 3})
+    return messages
+
+
+def make_surveys(weeks: List[str], seed: int = 7) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(seed)
+    return {
+        wk: {"confidence": rng.randint(0, 10), "anxiety": rng.randint(0, 10), "energy": rng.randint(0, 10), "notes": ""}
+        for wk in weeks
+    }
@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Sequence
+from urllib.parse import urlsplit
+
+from .constants import ALLOWED_SOURCE_DOMAINS
+
+_END = ""
+
+
+# 허용 도메인을 라벨 역순(com → example → www) suffix 트라이로 만들어 둔다.
+# "who.int"는 who.int와 *.who.int, ".gov"는 *.gov 처럼 "라벨 경계"에서만 일치한다.
+# → evil.gov.example.com 같은 호스트는 더 이상 통과하지 않는다.
+class DomainAllowlist:
+    def __init__(self, domains: Sequence[str], cache_size: int = 4096):
+        self._trie: Dict[str, Any] = {}
+        for dom in domains:
+            labels = [x for x in dom.strip().lower().strip(".").split(".") if x]
+            if not labels:
+                continue
+            node = self._trie
+            for label in reversed(labels):
+                node = node.setdefault(label, {})
+            node[_END] = True
+        self.host_allowed = lru_cache(maxsize=cache_size)(self._host_allowed)
+
+    def _host_allowed(self, host: str) -> bool:
+        node = self._trie
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+    def is_allowed(self, url: str) -> bool:
+        try:
+            parts = urlsplit((url or "").strip())
+            host = parts.hostname
+        except ValueError:
+            return False
+        if parts.scheme not in ("http", "https") or not host:
+            return False
+        return self.host_allowed(host.rstrip("."))
+
+    def validate_many(self, urls: Iterable[str]) -> List[bool]:
+        return [self.is_allowed(u) for u in urls]
+
+    # 검색 결과/출처 목록에서 허용 도메인 항목만 남긴다.
+    def filter_allowed(self, items: Iterable[Dict[str, Any]], key: str = "url") -> List[Dict[str, Any]]:
+        return [it for it in items if self.is_allowed(it.get(key) or "")]
+
+
+SOURCE_ALLOWLIST = DomainAllowlist(ALLOWED_SOURCE_DOMAINS)
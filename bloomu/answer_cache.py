@@ -0,0 +1,94 @@
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def normalize_message(text: str) -> str:
+    t = _PUNCT_RE.sub(" ", (text or "").lower())
+    return " ".join(t.split())
+
+
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    t = f" {normalize_message(text)} "
+    if len(t) <= n:
+        return frozenset([t])
+    return frozenset(t[i:i + n] for i in range(len(t) - n + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def answer_cache_bucket(settings: Dict[str, Any], signals: Dict[str, str], personal_context: List[str]) -> str:
+    # 같은 버킷 = 같은 설정(닉네임/말투/레벨/분야/증거모드) + 같은 핵심 신호 + 같은 개인 컨텍스트
+    parts = [
+        settings.get("nickname", ""),
+        settings.get("tone", ""),
+        settings.get("level", ""),
+        settings.get("domain", ""),
+        str(bool(settings.get("evidence_mode"))),
+        normalize_message(signals.get("goal", "")),
+        normalize_message(signals.get("current_status", "")),
+        normalize_message(signals.get("constraints", "")),
+        "\n".join(personal_context or []),
+    ]
+    return "|".join(parts)
+
+
+# 반복되는 첫 질문용 로컬 답변 캐시: 버킷 안에서 문자 3-gram 유사도가 threshold 이상이면 재사용한다.
+class AnswerCache:
+    def __init__(self, maxsize: int = 500, threshold: float = 0.7, ttl: float = 24 * 60 * 60):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, FrozenSet[str], Dict[str, Any]]]" = OrderedDict()
+        self._buckets: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, bucket: str, message: str) -> Optional[Dict[str, Any]]:
+        grams = char_ngrams(message)
+        now = time.time()
+        with self._lock:
+            best_key, best_score = None, 0.0
+            for norm in list(self._buckets.get(bucket, [])):
+                key = (bucket, norm)
+                expires, entry_grams, _ = self._entries[key]
+                if expires <= now:
+                    self._drop(key)
+                    continue
+                score = jaccard(grams, entry_grams)
+                if score > best_score:
+                    best_key, best_score = key, score
+            if best_key is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[best_key][2])
+
+    def store(self, bucket: str, message: str, value: Dict[str, Any]) -> None:
+        key = (bucket, normalize_message(message))
+        with self._lock:
+            if key not in self._entries:
+                self._buckets.setdefault(bucket, []).append(key[1])
+            self._entries[key] = (time.time() + self.ttl, char_ngrams(message), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+        norms = self._buckets.get(key[0], [])
+        if key[1] in norms:
+            norms.remove(key[1])
+        if not norms:
+            self._buckets.pop(key[0], None)
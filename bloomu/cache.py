@@ -0,0 +1,79 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+# 메모리 TTL + LRU 캐시. disk_path를 주면 SQLite 2차 캐시(재시작/다중 워커 공유)도 사용한다.
+class TTLCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 3600, disk_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._disk.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires, value = item
+                if expires > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, expires FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires),
+                )
+                self._disk.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+                self._disk.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "size": len(self._data),
+            }
+
+    def _remember(self, key: str, value: Any, expires: float) -> None:
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
@@ -5,6 +5,12 @@ TARGET = "20대 대학생"
 
 MODEL = "gpt-5-mini"
 
+# 채팅 1턴에서 근거 검색(Serper)에 쓸 수 있는 최대 대기 시간(초)
+EVIDENCE_BUDGET_S = 2.5
+
+# 이전 대화를 프롬프트에 넣을 때 쓰는 토큰 예산(대략치)
+CONTEXT_TOKEN_BUDGET = 1500
+
 TONE_OPTIONS = ["따뜻한 친구형", "현실직언형", "선배멘토형", "코치·트레이너형", "부모님형"]
 LEVEL_OPTIONS = ["완전 입문", "진행 중", "고급자"]
 DOMAIN_OPTIONS = ["진로", "연애", "전공공부", "일상 멘탈관리", "개인사정(가족/경제/관계)", "기타"]
@@ -27,7 +33,16 @@ ALLOWED_SOURCE_DOMAINS = [
     "indeed.com", "glassdoor.com", "ncs.gov", "moel.go.kr", "korea.kr"
 ]
 
+# 고위험 주제 키워드(카테고리별). 영문은 대소문자 구분 없이 매칭된다.
+RISK_LEXICON = {
+    "self_harm": ["자해", "죽고", "극단", "자살", "리스트컷"],
+    "medical": ["우울", "공황", "진단", "치료", "처방", "약", "병원"],
+    "finance": ["대출", "빚", "투자", "코인", "주식", "세금"],
+    "legal": ["고소", "합의", "소송", "불법", "사기", "폭력"],
+}
+
 PLAN_STATUS_OPTIONS = ["체크", "진행중", "미루기"]
+DAILY_METRICS = ["water", "exercise", "sleep", "condition", "custom"]
 STATUS_SORT_PRIORITY = {"진행중": 0, "미루기": 1, "체크": 2}
 DAYS = ["월", "화", "수", "목", "금", "토", "일"]
 DAY_TO_IDX = {d: i for i, d in enumerate(DAYS)}
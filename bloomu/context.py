@@ -0,0 +1,59 @@
+import math
+from typing import Any, Dict, List
+
+
+def estimate_tokens(text: str) -> int:
+    # 토크나이저 없이 쓰는 대략치: 영문/숫자 4글자 ≈ 1토큰, 한글 등 비ASCII 1글자 ≈ 1토큰
+    text = text or ""
+    ascii_chars = sum(1 for c in text if ord(c) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars))
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def answer_digest(ans: Dict[str, Any]) -> str:
+    # 지난 코칭 답변(answer dict)을 긴 summary_md 대신 짧은 구조화 요약으로 바꾼다.
+    parts = []
+    empathy = (ans.get("empathy_summary") or "").split(". ")[0]
+    if empathy:
+        parts.append(f"공감: {_clip(empathy, 80)}")
+    strategies = [_clip(s, 50) for s in (ans.get("strategies") or [])[:3] if s]
+    if strategies:
+        parts.append("전략: " + " / ".join(strategies))
+    ab = ans.get("ab_plans") or {}
+    titles = [f"{k}={_clip((ab.get(k) or {}).get('title', ''), 30)}" for k in ("A", "B") if (ab.get(k) or {}).get("title")]
+    if titles:
+        parts.append("플랜: " + ", ".join(titles))
+    return "[이전 코칭 요약] " + "; ".join(parts)
+
+
+def build_chat_context(
+    messages: List[Dict[str, Any]],
+    budget_tokens: int,
+    max_messages: int = 12,
+    full_answers: int = 1,
+) -> List[Dict[str, str]]:
+    # 최신 메시지부터 예산(budget_tokens) 안에서 담는다.
+    # 최근 full_answers개의 코칭 답변만 원문, 그 이전 답변은 answer_digest로 압축한다.
+    picked: List[Dict[str, str]] = []
+    used = 0
+    answers_seen = 0
+    for m in reversed(messages[-max_messages:]):
+        content = m.get("content") or ""
+        if m.get("role") == "assistant" and m.get("answer"):
+            answers_seen += 1
+            if answers_seen > full_answers:
+                content = answer_digest(m["answer"])
+        cost = estimate_tokens(content)
+        if used + cost > budget_tokens and m.get("role") == "assistant" and m.get("answer"):
+            content = answer_digest(m["answer"])
+            cost = estimate_tokens(content)
+        if used + cost > budget_tokens:
+            break
+        used += cost
+        picked.append({"role": m["role"], "content": content})
+    picked.reverse()
+    return picked
@@ -0,0 +1,157 @@
+import itertools
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .constants import DAILY_METRICS
+
+# 변경 카운터: 객체가 새로 만들어져도 값이 겹치지 않도록 프로세스 전체에서 하나를 쓴다.
+_VERSIONS = itertools.count(1)
+
+# 지표는 1~5 슬라이더 값이므로 0을 '기록 없음'으로 쓴다(평균/그래프에서는 빠진다).
+MISSING = 0
+
+
+# 날짜별 기록을 열(column) 단위 배열로 보관한다.
+# 지표 5개는 (지표 × 날짜) int8 2차원 배열 하나에, 메모/저장시각은 별도 dict에 둔다.
+# {날짜: {water, exercise, ..., memo, saved_at}} dict처럼 읽고 쓸 수 있다. 없는 지표는 None으로 읽힌다.
+class DailyPatternColumns(MutableMapping):
+    def __init__(self, capacity: int = 64):
+        self._dates = np.empty(capacity, dtype="datetime64[D]")
+        self._values = np.zeros((len(DAILY_METRICS), capacity), dtype=np.int8)
+        self._size = 0
+        self._sorted = True
+        self._rows: Dict[str, int] = {}
+        self.memos: Dict[str, str] = {}
+        self.saved_at: Dict[str, str] = {}
+        self.version = next(_VERSIONS)  # 기록이 바뀔 때마다 갱신
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict[str, Any]]) -> "DailyPatternColumns":
+        cols = cls(capacity=max(64, len(records or {})))
+        for day, rec in sorted((records or {}).items()):
+            cols[day] = rec
+        return cols
+
+    def __getitem__(self, day: str) -> Dict[str, Any]:
+        row = self._rows[day]
+        rec: Dict[str, Any] = {}
+        for i, m in enumerate(DAILY_METRICS):
+            v = int(self._values[i, row])
+            rec[m] = None if v == MISSING else v
+        rec["memo"] = self.memos.get(day, "")
+        if day in self.saved_at:
+            rec["saved_at"] = self.saved_at[day]
+        return rec
+
+    def __setitem__(self, day: str, rec: Dict[str, Any]) -> None:
+        row = self._rows.get(day)
+        if row is None:
+            if self._size == self._dates.shape[0]:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[day] = row
+            self._dates[row] = np.datetime64(day, "D")
+            if row and self._dates[row] < self._dates[row - 1]:
+                self._sorted = False
+        for i, m in enumerate(DAILY_METRICS):
+            self._values[i, row] = int(rec.get(m) or MISSING)
+        self.memos[day] = rec.get("memo", "") or ""
+        if rec.get("saved_at"):
+            self.saved_at[day] = rec["saved_at"]
+        self.version = next(_VERSIONS)
+
+    def __delitem__(self, day: str) -> None:
+        row = self._rows.pop(day)
+        last = self._size - 1
+        if row != last:
+            # 마지막 행을 빈 자리로 옮겨 O(1) 삭제
+            self._dates[row] = self._dates[last]
+            self._values[:, row] = self._values[:, last]
+            moved = str(self._dates[row])
+            self._rows[moved] = row
+            self._sorted = False
+        self._size = last
+        self.memos.pop(day, None)
+        self.saved_at.pop(day, None)
+        self.version = next(_VERSIONS)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._rows))
+
+    def __len__(self) -> int:
+        return self._size
+
+    # 통계/차트용 DataFrame. 값은 내부 배열을 복사하지 않는 view이므로 다음 저장 전까지만 사용한다.
+    # 기록 없는 칸은 nullable Int8의 mask로 표시해 NA로 보인다(0이 평균/그래프에 섞이지 않도록).
+    def to_frame(self) -> pd.DataFrame:
+        self._sort()
+        n = self._size
+        columns = {}
+        for i, m in enumerate(DAILY_METRICS):
+            values = self._values[i, :n]
+            columns[m] = pd.arrays.IntegerArray(values, values == MISSING)
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(self._dates[:n]), copy=False)
+
+    def _grow(self) -> None:
+        cap = max(64, self._dates.shape[0] * 2)
+        dates = np.empty(cap, dtype="datetime64[D]")
+        dates[:self._size] = self._dates[:self._size]
+        values = np.zeros((len(DAILY_METRICS), cap), dtype=np.int8)
+        values[:, :self._size] = self._values[:, :self._size]
+        self._dates, self._values = dates, values
+
+    def _sort(self) -> None:
+        if self._sorted:
+            return
+        n = self._size
+        order = np.argsort(self._dates[:n], kind="stable")
+        self._dates[:n] = self._dates[:n][order]
+        self._values[:, :n] = self._values[:, :n][:, order]
+        self._rows = {str(d): i for i, d in enumerate(self._dates[:n])}
+        self._sorted = True
+
+
+# 월/연 단위로 지표별 [합계, 개수]를 누적해 두고, 하루 기록이 저장될 때 O(1)로 갱신한다.
+class DailyRollup:
+    def __init__(self):
+        self.monthly: Dict[str, Dict[str, List[float]]] = {}
+        self.yearly: Dict[str, Dict[str, List[float]]] = {}
+        self.version = next(_VERSIONS)
+
+    @classmethod
+    def from_records(cls, records: Dict[str, Dict[str, Any]]) -> "DailyRollup":
+        rollup = cls()
+        for day, rec in (records or {}).items():
+            rollup.apply(day, None, rec)
+        return rollup
+
+    # 같은 날짜를 다시 저장하면 이전 값(old)을 빼고 새 값(new)을 더한다.
+    def apply(self, day: str, old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> None:
+        for bucket, period in ((self.monthly, day[:7]), (self.yearly, day[:4])):
+            acc = bucket.setdefault(period, {m: [0.0, 0] for m in DAILY_METRICS})
+            for m in DAILY_METRICS:
+                if old is not None and old.get(m) is not None:
+                    acc[m][0] -= old[m]
+                    acc[m][1] -= 1
+                if new.get(m) is not None:
+                    acc[m][0] += new[m]
+                    acc[m][1] += 1
+        self.version = next(_VERSIONS)
+
+    def monthly_frame(self) -> pd.DataFrame:
+        return self._frame(self.monthly)
+
+    def yearly_frame(self) -> pd.DataFrame:
+        return self._frame(self.yearly)
+
+    @staticmethod
+    def _frame(bucket: Dict[str, Dict[str, List[float]]]) -> pd.DataFrame:
+        rows = {
+            period: {m: (s / c if c else None) for m, (s, c) in acc.items()}
+            for period, acc in sorted(bucket.items())
+        }
+        return pd.DataFrame.from_dict(rows, orient="index", columns=DAILY_METRICS)
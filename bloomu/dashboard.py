@@ -0,0 +1,99 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+def build_week_row(wk: str, survey: Dict[str, Any], metrics: Dict[str, Any], total: int, done: int) -> Dict[str, Any]:
+    completion = round(100 * done / total, 1) if total else None
+    return {
+        "week": wk,
+        "confidence": survey.get("confidence"),
+        "anxiety": survey.get("anxiety"),
+        "energy": survey.get("energy"),
+        "plan_completion_%": completion,
+        "A_anxiety": (metrics.get("A") or {}).get("anxiety"),
+        "A_execution_%": (metrics.get("A") or {}).get("execution"),
+        "B_anxiety": (metrics.get("B") or {}).get("anxiety"),
+        "B_execution_%": (metrics.get("B") or {}).get("execution"),
+        "notes": survey.get("notes", ""),
+    }
+
+
+# 주차별 요약 행을 캐시해두고, 설문/A/B(invalidate 호출) 또는 플랜(version 변화)이 바뀐 주차만 다시 계산한다.
+# 백그라운드 미리 계산(warm)과 탭의 동기 계산(frame)이 같은 캐시를 쓰므로 lock으로 보호한다.
+class DashboardCache:
+    def __init__(self):
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._sigs: Dict[str, Tuple[int, int]] = {}
+        self._data_versions: Dict[str, int] = {}
+        self._weeks: List[str] = []
+        self._df: Optional[pd.DataFrame] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, wk: str) -> None:
+        with self._lock:
+            self._data_versions[wk] = self._data_versions.get(wk, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._sigs.clear()
+            self._df = None
+            self._generation += 1
+
+    # 주차별 (데이터 version, 플랜 version). 정수만 모으므로 매 실행마다 불러도 싸다.
+    def signatures(self, weeks: List[str], plan_version: Callable[[str], int]) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {wk: (self._data_versions.get(wk, 0), plan_version(wk)) for wk in weeks}
+
+    # 미리 계산 작업의 키: 주차 목록/서명이 같고 clear되지 않았으면 다시 만들 필요가 없다.
+    def preload_key(self, weeks: List[str], plan_version: Callable[[str], int]) -> Tuple[Any, ...]:
+        sigs = self.signatures(weeks, plan_version)
+        return (self._generation,) + tuple(sigs.items())
+
+    def stale_weeks(self, sigs: Dict[str, Tuple[int, int]]) -> List[str]:
+        with self._lock:
+            return [wk for wk, sig in sigs.items() if self._sigs.get(wk) != sig]
+
+    def frame(
+        self,
+        weeks: List[str],
+        build_row: Callable[[str], Dict[str, Any]],
+        plan_version: Callable[[str], int],
+    ) -> pd.DataFrame:
+        sigs = self.signatures(weeks, plan_version)
+        with self._lock:
+            self._refresh(weeks, sigs, build_row)
+            return self._df
+
+    # 워커 스레드용: 메인 스레드에서 떠 둔 서명(sigs)과 바뀐 주차의 행 입력(inputs)만으로 채운다.
+    # 그 사이 메인 스레드가 더 새 값으로 채운 주차가 있으면 건드리지 않는다.
+    def warm(
+        self,
+        weeks: List[str],
+        sigs: Dict[str, Tuple[int, int]],
+        inputs: Dict[str, Tuple[str, Dict[str, Any], Dict[str, Any], int, int]],
+    ) -> None:
+        with self._lock:
+            if any(wk not in inputs for wk in weeks if self._sigs.get(wk) != sigs[wk]):
+                return
+            self._refresh(weeks, sigs, lambda wk: build_week_row(*inputs[wk]))
+
+    def _refresh(
+        self,
+        weeks: List[str],
+        sigs: Dict[str, Tuple[int, int]],
+        build_row: Callable[[str], Dict[str, Any]],
+    ) -> None:
+        changed = self._df is None or weeks != self._weeks
+        for wk in weeks:
+            if self._sigs.get(wk) != sigs[wk]:
+                self._rows[wk] = build_row(wk)
+                self._sigs[wk] = sigs[wk]
+                changed = True
+
+        if changed:
+            self._weeks = list(weeks)
+            self._df = pd.DataFrame([self._rows[wk] for wk in weeks]).sort_values("week")
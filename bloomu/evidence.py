@@ -1,24 +1,72 @@
-from typing import Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
-import requests
+from .allowlist import SOURCE_ALLOWLIST
+from .cache import TTLCache
+from .evidence_index import local_sources
+from .transport import request_with_retry
 
-from .helpers import is_allowed_url
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=6 * 60 * 60)
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bloomu-search")
+
+
+def configure_search_cache(maxsize: int = 512, ttl: float = 6 * 60 * 60, disk_path: Optional[str] = None):
+    global _SEARCH_CACHE
+    _SEARCH_CACHE = TTLCache(maxsize=maxsize, ttl=ttl, disk_path=disk_path)
+
+
+def search_cache_stats() -> Dict[str, int]:
+    return _SEARCH_CACHE.stats()
+
+
+def _search_cache_key(query: str, k: int) -> str:
+    # 대소문자/공백 차이만 나는 질문은 같은 검색으로 본다.
+    return f"{' '.join((query or '').lower().split())}|{k}"
+
+
+# 캐시는 프로세스 전체(모든 세션)가 공유하므로, 호출자에게는 항상 복사본을 준다.
+def _copy_results(results: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    return [dict(item) for item in results]
 
 
 def serper_search(query: str, api_key: str, k: int = 5) -> List[Dict[str, str]]:
+    cache_key = _search_cache_key(query, k)
+    cached = _SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        return _copy_results(cached)
+
     url = "https://google.serper.dev/search"
     headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
     payload = {"q": query, "num": k}
-    r = requests.post(url, headers=headers, json=payload, timeout=12)
+    # 검색은 읽기 전용이라 POST여도 5xx/읽기 실패 재시도가 안전하다.
+    r = request_with_retry("POST", url, retries=2, idempotent=True, headers=headers, json=payload, timeout=12)
     r.raise_for_status()
     data = r.json()
-    out = []
-    for item in (data.get("organic") or [])[:k]:
-        link = item.get("link", "")
-        title = item.get("title", "")
-        if is_allowed_url(link):
-            out.append({"title": title, "url": link})
-    return out
+    out = SOURCE_ALLOWLIST.filter_allowed(
+        {"title": item.get("title", ""), "url": item.get("link", "")}
+        for item in (data.get("organic") or [])[:k]
+    )
+    _SEARCH_CACHE.set(cache_key, out)
+    return _copy_results(out)
+
+
+def start_evidence_lookup(query: str, api_key: str, k: int = 5) -> Future:
+    # 검색은 백그라운드 스레드에서 진행 → 그동안 프롬프트 조립을 계속할 수 있다.
+    return _SEARCH_POOL.submit(serper_search, query, api_key, k)
+
+
+def resolve_sources(lookup: Optional[Any], domain: str, timeout: float, query: str = "") -> List[Dict[str, str]]:
+    # lookup: Future 또는 retrieval.HybridLookup(둘 다 .result(timeout) 제공)
+    # 예산(timeout) 안에 검색이 끝나지 않거나 실패/결과 없음이면 로컬 색인 → 큐레이션 소스 순으로 대체.
+    # 늦게 끝난 검색 결과도 캐시에는 저장되므로 다음 질문에서 재사용된다.
+    if lookup is not None:
+        try:
+            found = lookup.result(timeout=timeout)
+            if found:
+                return found
+        except Exception:
+            pass
+    return local_sources(query, domain) or curated_sources(domain)
 
 
 def curated_sources(domain: str) -> List[Dict[str, str]]:
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .helpers import is_allowed_url
+
+CORPUS_PATH = Path(__file__).parent / "data" / "evidence_corpus.json"
+DOMAIN_BONUS = 1.0
+
+_TOKEN_RE = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+_HANGUL_RE = re.compile(r"[가-힣]")
+
+
+def fts_query(text: str, max_terms: int = 16) -> str:
+    # 사용자 문장 → FTS5 OR 쿼리. 한글은 조사/어미가 붙으므로 앞 2글자 prefix로 검색(불안해요 → 불안*).
+    terms: List[str] = []
+    for tok in _TOKEN_RE.findall((text or "").lower()):
+        if _HANGUL_RE.match(tok):
+            if len(tok) < 2:
+                continue
+            tok = tok[:2]
+        elif len(tok) < 3:
+            continue
+        term = f'"{tok}"*'
+        if term not in terms:
+            terms.append(term)
+        if len(terms) >= max_terms:
+            break
+    return " OR ".join(terms)
+
+
+# 허용 도메인 큐레이션 문서(제목/요약/키워드)를 SQLite FTS5로 색인해 두고 bm25로 top-k를 찾는다.
+# 네트워크 없이 수 ms 안에 끝나므로 SERPER_API_KEY가 없어도 증거기반모드를 쓸 수 있다.
+class EvidenceIndex:
+    def __init__(self, path: str = ":memory:", corpus_path: Path = CORPUS_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS evidence USING fts5("
+                "title, snippet, keywords, url UNINDEXED, domains UNINDEXED, tokenize = 'unicode61')"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS evidence_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.commit()
+        self.load_corpus(corpus_path)
+
+    # 코퍼스 파일이 바뀐 경우에만 다시 색인한다(디스크 경로를 쓰면 재시작 후에도 재사용).
+    def load_corpus(self, corpus_path: Path) -> int:
+        raw = Path(corpus_path).read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM evidence_meta WHERE key = 'corpus_sha1'").fetchone()
+            if row and row[0] == digest:
+                return self._conn.execute("SELECT count(*) FROM evidence").fetchone()[0]
+
+            docs = [d for d in json.loads(raw.decode("utf-8")) if is_allowed_url(d.get("url", ""))]
+            self._conn.execute("DELETE FROM evidence")
+            self._conn.executemany(
+                "INSERT INTO evidence (title, snippet, keywords, url, domains) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (d.get("title", ""), d.get("snippet", ""), d.get("keywords", ""), d["url"], "|".join(d.get("domains") or []))
+                    for d in docs
+                ],
+            )
+            self._conn.execute(
+                "INSERT INTO evidence_meta (key, value) VALUES ('corpus_sha1', ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (digest,),
+            )
+            self._conn.commit()
+        return len(docs)
+
+    def search(self, query: str, domain: str = "", k: int = 5) -> List[Dict[str, str]]:
+        match = fts_query(query)
+        if not match:
+            return []
+        # bm25는 작을수록 관련도가 높다. 상담 분야(domain)가 같은 문서는 보너스만큼 앞으로.
+        sql = (
+            "SELECT title, url, snippet, "
+            "bm25(evidence, 5.0, 1.0, 3.0) - CASE WHEN instr('|' || domains || '|', ?) > 0 THEN ? ELSE 0 END AS score "
+            "FROM evidence WHERE evidence MATCH ? ORDER BY score LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (f"|{domain}|", DOMAIN_BONUS, match, k)).fetchall()
+        return [{"title": t, "url": u, "snippet": s} for t, u, s, _ in rows]
+
+
+_INDEX: Optional[EvidenceIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_evidence_index(path: Optional[str] = None) -> EvidenceIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = EvidenceIndex(path or ":memory:")
+        return _INDEX
+
+
+def local_sources(query: str, domain: str, k: int = 5) -> List[Dict[str, Any]]:
+    try:
+        return get_evidence_index().search(query, domain, k)
+    except (OSError, sqlite3.Error, ValueError):
+        return []
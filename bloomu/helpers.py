@@ -1,14 +1,16 @@
 import datetime as dt
+import uuid
 from typing import Any, Dict, List, Optional
 
 from .constants import (
-    ALLOWED_SOURCE_DOMAINS,
     DAYS,
     DAY_TO_IDX,
     IDX_TO_DAY,
     PLAN_STATUS_OPTIONS,
     STATUS_SORT_PRIORITY,
 )
+from .allowlist import SOURCE_ALLOWLIST
+from .risk import RISK_MATCHER
 
 
 def today() -> dt.date:
@@ -47,19 +49,13 @@ def week_label_yy_mm_ww_from_week_start(week_start: dt.date) -> str:
 
 
 def is_allowed_url(url: str) -> bool:
-    u = (url or "").lower()
-    return u.startswith("http") and any(dom in u for dom in ALLOWED_SOURCE_DOMAINS)
+    # 호스트명을 파싱해 허용 도메인 suffix 트라이로 판정(bloomu.allowlist, 결과는 LRU 캐시)
+    return SOURCE_ALLOWLIST.is_allowed(url)
 
 
 def detect_high_risk(text: str) -> bool:
-    k = [
-        "자해", "죽고", "극단", "우울", "공황", "자살", "리스트컷",
-        "진단", "치료", "처방", "약", "병원",
-        "대출", "빚", "투자", "코인", "주식", "세금",
-        "고소", "합의", "소송", "불법", "사기", "폭력",
-    ]
-    t = (text or "").lower()
-    return any(x in t for x in k)
+    # 키워드 사전은 bloomu.risk에서 정규식 1개로 미리 컴파일해 두고 한 번만 훑는다.
+    return RISK_MATCHER.is_high_risk(text)
 
 
 def normalize_day_label(day: str) -> str:
@@ -67,13 +63,15 @@ def normalize_day_label(day: str) -> str:
     return d if d in DAYS else ""
 
 
-def task_uid(task: str, day: str, wk: str) -> str:
-    h = abs(hash((task or "").strip())) % 1_000_000
-    return f"{wk}_{day}_{h}"
+def make_task_id() -> str:
+    # 내용(주차/할일/시각)으로 만들면 같은 할일을 여러 요일에 넣을 때 ID가 겹친다 → 생성 시 무작위 ID 부여.
+    # ID는 task와 함께 저장되므로 재시작/워커 간에도 그대로 유지된다.
+    return uuid.uuid4().hex
 
 
 def ensure_task_shape(t: Dict[str, Any], wk: str) -> Dict[str, Any]:
     out = {
+        "id": t.get("id") or "",
         "week": t.get("week") or wk,
         "day": normalize_day_label(t.get("day") or ""),
         "task": (t.get("task") or "").strip(),
@@ -88,6 +86,11 @@ def ensure_task_shape(t: Dict[str, Any], wk: str) -> Dict[str, Any]:
             out["status"] = "진행중"
     if out["status"] not in PLAN_STATUS_OPTIONS:
         out["status"] = "진행중"
+    # ✅ ID는 처음 만들 때 한 번만 부여하고 이후(이동/상태 변경)에는 그대로 유지
+    # 주의: id가 없는 dict는 부를 때마다 새 무작위 ID를 받는다(결정적이지 않음).
+    #       같은 입력을 두 번 정규화하지 말고, 한 번 만든 결과(out)를 저장/재사용해야 한다.
+    if not out["id"]:
+        out["id"] = make_task_id()
     return out
 
 
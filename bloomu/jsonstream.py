@@ -0,0 +1,170 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# LLM이 스트리밍하는 JSON 객체를 받아, 최상위 키가 완성될 때마다 바로 파싱한다.
+class IncrementalJSONObject:
+    def __init__(self):
+        self.result: Dict[str, Any] = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_str = False
+        self._esc = False
+        self._expect = "key"
+        self._key = ""
+        self._tok_start = 0
+        self._value_start = 0
+
+    # chunk를 이어 붙이고, 이번에 새로 완성된 최상위 키 목록을 반환
+    def feed(self, chunk: str) -> List[str]:
+        self._buf += chunk or ""
+        completed: List[str] = []
+        buf = self._buf
+        i = self._pos
+        while i < len(buf) and not self.done:
+            c = buf[i]
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif c == "\\":
+                    self._esc = True
+                elif c == '"':
+                    self._in_str = False
+                    if self._depth == 1:
+                        if self._expect == "key_str":
+                            self._key = json.loads(buf[self._tok_start:i + 1])
+                            self._expect = "colon"
+                        elif self._expect == "value":
+                            completed.append(self._complete(buf[self._value_start:i + 1]))
+                i += 1
+                continue
+
+            if self._depth == 0:
+                # 코드펜스(```json) 등 객체 앞의 잡음은 건너뛴다.
+                if c == "{":
+                    self._depth = 1
+                    self._expect = "key"
+                i += 1
+                continue
+
+            if self._depth == 1 and self._expect == "value_start" and not c.isspace():
+                self._value_start = i
+                self._expect = "value"
+
+            if c == '"':
+                self._in_str = True
+                if self._depth == 1 and self._expect == "key":
+                    self._tok_start = i
+                    self._expect = "key_str"
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                if self._depth == 1:
+                    if self._expect == "value":
+                        completed.append(self._complete(buf[self._value_start:i].strip()))
+                    self._depth = 0
+                    self.done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 1 and self._expect == "value":
+                        completed.append(self._complete(buf[self._value_start:i + 1]))
+            elif self._depth == 1:
+                if c == ":" and self._expect == "colon":
+                    self._expect = "value_start"
+                elif c == ",":
+                    if self._expect == "value":
+                        completed.append(self._complete(buf[self._value_start:i].strip()))
+                    self._expect = "key"
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def close(self) -> Dict[str, Any]:
+        if not self.done:
+            # 응답이 중간에 잘렸으면 괄호를 닫아 살릴 수 있는 데까지 살린다.
+            repaired = repair_json(self._buf)
+            if repaired is None:
+                raise ValueError("JSON 응답이 끝까지 도착하지 않았어요.")
+            self.result = repaired
+            self.done = True
+        return self.result
+
+    def _complete(self, raw: str) -> str:
+        self.result[self._key] = json.loads(raw)
+        self._expect = "after_value"
+        return self._key
+
+
+def _scan(txt: str) -> Tuple[List[str], bool, List[int]]:
+    # 문자열 밖의 열린 괄호 스택, 문자열 안에서 끝났는지, 문자열 밖 콤마 위치
+    stack: List[str] = []
+    commas: List[int] = []
+    in_str = False
+    esc = False
+    for i, c in enumerate(txt):
+        if in_str:
+            if esc:
+                esc = False
+            elif c == "\\":
+                esc = True
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+        elif c in "}]":
+            if stack:
+                stack.pop()
+        elif c == ",":
+            commas.append(i)
+    return stack, in_str, commas
+
+
+def _close(txt: str) -> Optional[Any]:
+    stack, in_str, _ = _scan(txt)
+    if in_str:
+        txt += '"'
+    try:
+        return json.loads(txt + "".join(reversed(stack)))
+    except json.JSONDecodeError:
+        return None
+
+
+# 잘린(truncated) JSON 복구: 열린 문자열/괄호를 닫아 보고, 안 되면 마지막 콤마 앞까지 잘라 다시 닫는다.
+def repair_json(txt: str) -> Optional[Dict[str, Any]]:
+    start = (txt or "").find("{")
+    if start == -1:
+        return None
+    txt = txt[start:].rstrip()
+
+    value = _close(txt)
+    if isinstance(value, dict):
+        return value
+    _, _, commas = _scan(txt)
+    for cut in reversed(commas):
+        value = _close(txt[:cut])
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+# 코드펜스/앞뒤 잡음에 관대한 파서: 정상 JSON이면 그대로, 잘렸으면 repair_json으로 복구
+def parse_json_tolerant(txt: str) -> Dict[str, Any]:
+    txt = (txt or "").strip()
+    start = txt.find("{")
+    end = txt.rfind("}")
+    if start != -1 and end > start:
+        try:
+            value = json.loads(txt[start:end + 1])
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+    value = repair_json(txt)
+    if value is None:
+        raise ValueError("AI 응답에서 JSON 객체를 찾지 못했어요.")
+    return value
@@ -0,0 +1,290 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import DAYS
+from .helpers import ensure_task_shape, sort_tasks_for_day
+from .storage import task_row_key
+from .transport import RateLimiter, request_with_retry
+
+NOTION_API = "https://api.notion.com/v1"
+NOTION_MAX_CHILDREN = 100  # 요청 1번에 보낼 수 있는 블록 수 한도
+
+_NOTION_LIMITER = RateLimiter(per_second=3.0)
+
+
+def notion_headers(token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Notion-Version": "2022-06-28",
+        "Content-Type": "application/json",
+    }
+
+
+def _rt(text: str) -> Dict[str, Any]:
+    return {"type": "text", "text": {"content": text}}
+
+
+class NotionError(RuntimeError):
+    def __init__(self, status: int, text: str):
+        super().__init__(f"Notion 저장 실패: {status} - {text}")
+        self.status = status
+
+
+def notion_request(method: str, path: str, token: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    _NOTION_LIMITER.wait()
+    r = request_with_retry(method, f"{NOTION_API}{path}", headers=notion_headers(token), json=payload, timeout=25)
+    if r.status_code >= 300:
+        raise NotionError(r.status_code, r.text)
+    return r.json() or {}
+
+
+def notion_list_children(token: str, block_id: str) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    cursor = ""
+    while True:
+        path = f"/blocks/{block_id}/children?page_size=100"
+        if cursor:
+            path += f"&start_cursor={cursor}"
+        data = notion_request("GET", path, token)
+        out.extend(data.get("results") or [])
+        cursor = data.get("next_cursor") or ""
+        if not data.get("has_more") or not cursor:
+            return out
+
+
+def _week_task_order(wk: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # 페이지에 to_do 블록이 놓이는 순서(요일 → 상태/생성순) 그대로 반환
+    tasks_norm = [ensure_task_shape(t, wk) for t in (tasks or []) if (t.get("task") or "").strip()]
+    ordered: List[Dict[str, Any]] = []
+    for d in DAYS:
+        ordered.extend(sort_tasks_for_day([t for t in tasks_norm if t.get("day") == d]))
+    return ordered
+
+
+def _task_line(t: Dict[str, Any], with_day: bool = False) -> str:
+    status = t.get("status", "진행중")
+    icon = "✅" if status == "체크" else ("⏳" if status == "진행중" else "🕒")
+    day = f"({t.get('day')}) " if with_day else ""
+    return f"{icon} {day}[{status}] {t.get('task','')}"
+
+
+def _todo_payload(t: Dict[str, Any], with_day: bool = False) -> Dict[str, Any]:
+    return {"rich_text": [_rt(_task_line(t, with_day))], "checked": t.get("status") == "체크"}
+
+
+def _task_block(t: Dict[str, Any], with_day: bool = False) -> Dict[str, Any]:
+    return {"object": "block", "type": "to_do", "to_do": _todo_payload(t, with_day)}
+
+
+def build_week_plan_blocks(week_label: str, wk: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    blocks: List[Dict[str, Any]] = []
+    blocks.append({
+        "object": "block",
+        "type": "heading_2",
+        "heading_2": {"rich_text": [_rt(f"주간 액티브 플랜 · {week_label}")]}
+    })
+    blocks.append({
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {"rich_text": [_rt(f"WeekKey: {wk}")]}
+    })
+
+    current_day = ""
+    for t in _week_task_order(wk, tasks):
+        if t.get("day") != current_day:
+            current_day = t.get("day")
+            blocks.append({
+                "object": "block",
+                "type": "heading_3",
+                "heading_3": {"rich_text": [_rt(current_day)]}
+            })
+        blocks.append(_task_block(t))
+
+    if len(blocks) <= 2:
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {"rich_text": [_rt("이번 주에 저장할 플랜이 없어요.")]},
+        })
+    return blocks
+
+
+def notion_export_week(
+    token: str,
+    db_id: str,
+    title_prop: str,
+    week_label: str,
+    wk: str,
+    tasks: List[Dict[str, Any]],
+    progress: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    # progress에 page_id/appended를 기록해 두므로, 중간에 실패해도 같은 dict로 다시 부르면 이어서 진행한다.
+    progress = progress if progress is not None else {}
+    if progress.get("done"):
+        return progress
+
+    blocks = build_week_plan_blocks(week_label, wk, tasks)
+    if not progress.get("page_id"):
+        title = f"{week_label} · Bloom U 플랜"
+        # ✅ Notion DB마다 Title property 이름이 다를 수 있어서 사용자 입력값(title_prop)을 사용
+        payload = {
+            "parent": {"database_id": db_id},
+            "properties": {title_prop: {"title": [_rt(title)]}},
+            "children": blocks[:NOTION_MAX_CHILDREN],
+        }
+        page = notion_request("POST", "/pages", token, payload)
+        progress["page_id"] = page.get("id", "")
+        progress["url"] = page.get("url", "")
+        progress["appended"] = min(len(blocks), NOTION_MAX_CHILDREN)
+
+    # 100개를 넘는 블록은 PATCH /blocks/{id}/children 으로 나눠서 이어 붙인다.
+    while progress["appended"] < len(blocks):
+        chunk = blocks[progress["appended"]:progress["appended"] + NOTION_MAX_CHILDREN]
+        notion_request("PATCH", f"/blocks/{progress['page_id']}/children", token, {"children": chunk})
+        progress["appended"] += len(chunk)
+
+    progress["done"] = True
+    return progress
+
+
+def notion_create_week_page(token: str, db_id: str, title_prop: str, week_label: str, wk: str, tasks: List[Dict[str, Any]]) -> str:
+    return notion_export_week(token, db_id, title_prop, week_label, wk, tasks).get("url", "")
+
+
+def notion_export_weeks(
+    token: str,
+    db_id: str,
+    title_prop: str,
+    weeks: List[Tuple[str, str, List[Dict[str, Any]]]],
+    records: Dict[str, Dict[str, Any]],
+    max_workers: int = 3,
+) -> Dict[str, str]:
+    # weeks: [(wk, week_label, tasks)], records: {wk: notion_sync_week 기록}
+    # ✅ 단건 저장과 같은 기록을 쓰므로, 이미 저장된 주차는 새 페이지 대신 바뀐 액션만 반영된다.
+    # 반환값: 실패한 주차별 에러 메시지
+    for wk, _, _ in weeks:
+        records.setdefault(wk, {})
+
+    errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bloomu-notion") as pool:
+        futures = {
+            wk: pool.submit(notion_sync_week, token, db_id, title_prop, label, wk, tasks, records[wk])
+            for wk, label, tasks in weeks
+        }
+        for wk, fut in futures.items():
+            try:
+                fut.result()
+            except Exception as e:
+                errors[wk] = str(e)
+    return errors
+
+
+def _page_gone(token: str, page_id: str) -> bool:
+    # 404가 났을 때 페이지 자체가 지워졌는지(휴지통 포함) 확인한다. 블록 하나만 없어진 경우와 구분하기 위함.
+    try:
+        page = notion_request("GET", f"/pages/{page_id}", token)
+    except NotionError as e:
+        if e.status == 404:
+            return True
+        raise
+    return bool(page.get("archived") or page.get("in_trash"))
+
+
+def _task_snapshot(t: Dict[str, Any]) -> Dict[str, Any]:
+    return {"status": t.get("status"), "text": t.get("task", ""), "day": t.get("day", "")}
+
+
+def notion_sync_week(
+    token: str,
+    db_id: str,
+    title_prop: str,
+    week_label: str,
+    wk: str,
+    tasks: List[Dict[str, Any]],
+    record: Dict[str, Any],
+) -> Dict[str, int]:
+    # record: {page_id, url, blocks: {task_key: block_id}, snapshot: {task_key: {status, text, day}}}
+    # 처음이면 페이지를 만들고 블록 ID를 기억, 이후에는 바뀐 to_do 블록만 수정/추가/삭제한다.
+    # 페이지를 만드는 도중 실패하면 record["export"]에 진행 상태가 남아, 다시 부를 때 같은 페이지에 이어 붙인다.
+    current = {task_row_key(t): t for t in _week_task_order(wk, tasks)}
+    if record.get("page_id"):
+        try:
+            return _sync_existing_page(token, current, record)
+        except NotionError as e:
+            # 사용자가 페이지를 지운 경우에만 새로 만든다(블록 하나가 없어진 404는 _sync_existing_page에서 처리).
+            if e.status != 404 or not _page_gone(token, record["page_id"]):
+                raise
+            record.clear()
+
+    progress = notion_export_week(token, db_id, title_prop, week_label, wk, tasks, record.setdefault("export", {}))
+    todo_ids = [b.get("id") for b in notion_list_children(token, progress["page_id"]) if b.get("type") == "to_do"]
+    record.pop("export", None)
+    record.update({
+        "page_id": progress["page_id"],
+        "url": progress.get("url", ""),
+        "blocks": dict(zip(current.keys(), todo_ids)),
+        "snapshot": {k: _task_snapshot(t) for k, t in current.items()},
+    })
+    return {"created": 1, "updated": 0, "added": len(current), "removed": 0}
+
+
+def _sync_existing_page(token: str, current: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> Dict[str, int]:
+    blocks: Dict[str, str] = record.setdefault("blocks", {})
+    snapshot: Dict[str, Any] = record.setdefault("snapshot", {})
+    stats = {"created": 0, "updated": 0, "added": 0, "removed": 0}
+
+    moved = set()
+    for key, t in current.items():
+        snap = _task_snapshot(t)
+        old = snapshot.get(key)
+        if key not in blocks or old == snap:
+            continue
+        # 요일이 바뀐 액션(미루기 등)은 제자리 수정하면 이전 요일 제목 아래에 남으므로,
+        # 블록을 지우고 아래에서 (요일) 표시와 함께 다시 붙인다. day가 없는 예전 기록은 같은 요일로 본다.
+        if (old or {}).get("day", snap["day"]) != snap["day"]:
+            _delete_block(token, blocks.pop(key))
+            snapshot.pop(key, None)
+            moved.add(key)
+            continue
+        try:
+            notion_request("PATCH", f"/blocks/{blocks[key]}", token, {"to_do": _todo_payload(t)})
+        except NotionError as e:
+            if e.status != 404:
+                raise
+            # 사용자가 직접 지운 블록: 기록에서 빼고 아래에서 다시 붙인다.
+            blocks.pop(key)
+            snapshot.pop(key, None)
+            moved.add(key)
+            continue
+        snapshot[key] = snap
+        stats["updated"] += 1
+
+    # 새 액션은 페이지 끝에 (요일) 표시와 함께 붙인다.
+    new_items = [(k, t) for k, t in current.items() if k not in blocks]
+    for i in range(0, len(new_items), NOTION_MAX_CHILDREN):
+        chunk = new_items[i:i + NOTION_MAX_CHILDREN]
+        res = notion_request(
+            "PATCH",
+            f"/blocks/{record['page_id']}/children",
+            token,
+            {"children": [_task_block(t, with_day=True) for _, t in chunk]},
+        )
+        for (k, t), b in zip(chunk, res.get("results") or []):
+            blocks[k] = b.get("id")
+            snapshot[k] = _task_snapshot(t)
+            stats["updated" if k in moved else "added"] += 1
+
+    for k in [k for k in blocks if k not in current]:
+        _delete_block(token, blocks[k])
+        blocks.pop(k)
+        snapshot.pop(k, None)
+        stats["removed"] += 1
+    return stats
+
+
+def _delete_block(token: str, block_id: str) -> None:
+    try:
+        notion_request("DELETE", f"/blocks/{block_id}", token)
+    except NotionError as e:
+        if e.status != 404:  # 이미 지워진 블록이면 할 일이 없다.
+            raise
@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .constants import PLAN_STATUS_OPTIONS
+from .helpers import ensure_task_shape
+
+
+# 주간 플랜 저장소: {week: [task, ...]} 처럼 읽을 수 있으면서
+# (week, day) / (week, status) 인덱스를 유지해 조회·이동·상태 변경을 O(1)로 처리한다.
+# 인덱스는 dict를 "순서 있는 집합"으로 사용(삽입 순서 유지 + O(1) 삭제).
+class PlanStore:
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._by_week: Dict[str, Dict[str, None]] = {}
+        self._by_day: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._by_status: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._versions: Dict[str, int] = {}
+
+    @classmethod
+    def from_dict(cls, plan_by_week: Dict[str, List[Dict[str, Any]]]) -> "PlanStore":
+        store = cls()
+        for wk, tasks in (plan_by_week or {}).items():
+            store._by_week.setdefault(wk, {})
+            for t in tasks or []:
+                if (t.get("task") or "").strip():
+                    store.add(t, wk)
+        return store
+
+    # ---- 읽기 (dict 호환) ----
+    def get(self, wk: str, default: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        ids = self._by_week.get(wk)
+        if ids is None:
+            return default if default is not None else []
+        return [self._tasks[tid] for tid in ids]
+
+    def __getitem__(self, wk: str) -> List[Dict[str, Any]]:
+        if wk not in self._by_week:
+            raise KeyError(wk)
+        return self.get(wk)
+
+    def __contains__(self, wk: object) -> bool:
+        return wk in self._by_week
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._by_week))
+
+    def __len__(self) -> int:
+        return len(self._by_week)
+
+    def keys(self) -> List[str]:
+        return list(self._by_week)
+
+    def items(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        return [(wk, self.get(wk)) for wk in self._by_week]
+
+    def get_task(self, tid: str) -> Optional[Dict[str, Any]]:
+        return self._tasks.get(tid)
+
+    def day_items(self, wk: str, day: str) -> List[Dict[str, Any]]:
+        return [self._tasks[tid] for tid in self._by_day.get((wk, day), {})]
+
+    def count(self, wk: str, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self._by_week.get(wk, {}))
+        return len(self._by_status.get((wk, status), {}))
+
+    def total(self) -> int:
+        return len(self._tasks)
+
+    def version(self, wk: str) -> int:
+        return self._versions.get(wk, 0)
+
+    # ---- 쓰기 ----
+    def add(self, t: Dict[str, Any], wk: Optional[str] = None) -> Dict[str, Any]:
+        task = ensure_task_shape(t, wk or t.get("week") or "")
+        tid = task["id"]
+        if tid in self._tasks:
+            # 조용히 덮어쓰면 다른 task가 사라진다 → 호출 쪽 버그로 보고 바로 알린다.
+            raise ValueError(f"이미 있는 task id예요: {tid}")
+        self._tasks[tid] = task
+        self._index(tid, task)
+        return task
+
+    def replace_week(self, wk: str, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for tid in list(self._by_week.get(wk, {})):
+            self.remove(tid)
+        self._by_week.setdefault(wk, {})
+        return [self.add(t, wk) for t in tasks or [] if (t.get("task") or "").strip()]
+
+    def remove(self, tid: str) -> Optional[Dict[str, Any]]:
+        task = self._tasks.pop(tid, None)
+        if task is None:
+            return None
+        self._unindex(tid, task)
+        return task
+
+    def set_status(self, tid: str, status: str) -> None:
+        task = self._tasks[tid]
+        if status not in PLAN_STATUS_OPTIONS or task.get("status") == status:
+            return
+        wk = task["week"]
+        self._by_status.get((wk, task["status"]), {}).pop(tid, None)
+        task["status"] = status
+        self._by_status.setdefault((wk, status), {})[tid] = None
+        self._bump(wk)
+
+    def move(self, tid: str, wk: str, day: str) -> Dict[str, Any]:
+        task = self._tasks[tid]
+        self._unindex(tid, task)
+        task["week"] = wk
+        task["day"] = day
+        self._index(tid, task)
+        return task
+
+    def _index(self, tid: str, task: Dict[str, Any]) -> None:
+        wk = task["week"]
+        self._by_week.setdefault(wk, {})[tid] = None
+        self._by_day.setdefault((wk, task["day"]), {})[tid] = None
+        self._by_status.setdefault((wk, task["status"]), {})[tid] = None
+        self._bump(wk)
+
+    def _unindex(self, tid: str, task: Dict[str, Any]) -> None:
+        wk = task["week"]
+        self._by_week.get(wk, {}).pop(tid, None)
+        self._by_day.get((wk, task["day"]), {}).pop(tid, None)
+        self._by_status.get((wk, task["status"]), {}).pop(tid, None)
+        self._bump(wk)
+
+    def _bump(self, wk: str) -> None:
+        self._versions[wk] = self._versions.get(wk, 0) + 1
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .daily import DailyRollup
+
+_PRELOAD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bloomu-preload")
+
+
+# 탭 결과물을 백그라운드에서 미리 계산해 두는 세션별 보관함.
+# 작업 함수에는 메인 스레드에서 떠 둔 스냅샷만 넘긴다(워커에서 st.session_state에 접근하지 않음).
+# 결과는 입력의 변경 카운터로 만든 key와 함께 저장되고, key가 같을 때만 꺼내 쓴다.
+class Preloader:
+    def __init__(self):
+        self._jobs: Dict[str, Tuple[Any, Future]] = {}
+        self._lock = threading.Lock()
+
+    def is_current(self, name: str, key: Any) -> bool:
+        with self._lock:
+            job = self._jobs.get(name)
+        return job is not None and job[0] == key
+
+    def submit(self, name: str, key: Any, fn: Callable[..., Any], *args: Any) -> None:
+        with self._lock:
+            self._jobs[name] = (key, _PRELOAD_POOL.submit(fn, *args))
+
+    def get(self, name: str, key: Any) -> Optional[Any]:
+        with self._lock:
+            job = self._jobs.get(name)
+        if job is None or job[0] != key:
+            return None
+        fut = job[1]
+        if not fut.done() or fut.exception() is not None:
+            return None
+        return fut.result()
+
+
+# 월/연 평균 표만 만든다. 일별 전체 데이터는 그래프를 펼칠 때만 탭에서 만든다.
+def build_daily_tables(
+    monthly: Dict[str, Dict[str, List[float]]],
+    yearly: Dict[str, Dict[str, List[float]]],
+) -> Dict[str, pd.DataFrame]:
+    rollup = DailyRollup()
+    rollup.monthly = monthly
+    rollup.yearly = yearly
+    return {
+        "monthly": rollup.monthly_frame().round(2),
+        "yearly": rollup.yearly_frame().round(2),
+    }
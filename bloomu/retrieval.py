@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .allowlist import SOURCE_ALLOWLIST
+from .constants import ALLOWED_SOURCE_DOMAINS
+from .evidence import curated_sources, start_evidence_lookup
+from .evidence_index import local_sources
+
+RRF_K = 60
+OVERFETCH = 3
+MAX_SERPER_RESULTS = 20
+PREFETCH_TTL_S = 6 * 60 * 60
+
+# 결과 목록별 가중치: 질문 맞춤 검색 > 로컬 색인 > 분야 프리패치 > 하드코딩 큐레이션
+SOURCE_WEIGHTS = {"serper": 1.0, "serper_site": 1.0, "local": 0.9, "prefetch": 0.6, "curated": 0.4}
+
+_PREFETCH: Dict[str, Tuple[float, Future]] = {}
+_PREFETCH_LOCK = threading.Lock()
+
+
+def site_filter(domains: Sequence[str] = ALLOWED_SOURCE_DOMAINS) -> str:
+    return "(" + " OR ".join(f"site:{d.strip('.')}" for d in domains) + ")"
+
+
+def canonical_url(url: str) -> str:
+    # 중복 제거용: 스킴/www./끝 슬래시/fragment 차이는 같은 문서로 본다.
+    parts = urlsplit((url or "").strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def reciprocal_rank_fusion(
+    ranked: Dict[str, List[Dict[str, str]]],
+    weights: Optional[Dict[str, float]] = None,
+    k: int = RRF_K,
+) -> List[Dict[str, str]]:
+    # score(url) = Σ weight / (k + rank). 같은 URL은 처음(가중치 높은 목록) 본 항목을 대표로 남긴다.
+    weights = weights or SOURCE_WEIGHTS
+    scores: Dict[str, float] = {}
+    items: Dict[str, Dict[str, str]] = {}
+    for name, results in sorted(ranked.items(), key=lambda kv: -weights.get(kv[0], 1.0)):
+        seen = set()
+        for rank, item in enumerate(SOURCE_ALLOWLIST.filter_allowed(results or []), start=1):
+            key = canonical_url(item["url"])
+            if key in seen:
+                continue
+            seen.add(key)
+            scores[key] = scores.get(key, 0.0) + weights.get(name, 1.0) / (k + rank)
+            items.setdefault(key, item)
+    return [items[key] for key in sorted(scores, key=lambda key: -scores[key])]
+
+
+# 분야(domain)별 일반 검색을 미리 돌려 둔다. 사이드바에서 분야를 바꾸면 호출 → 첫 질문이 검색을 기다리지 않는다.
+def prefetch_domain(domain: str, api_key: str) -> None:
+    now = time.monotonic()
+    with _PREFETCH_LOCK:
+        entry = _PREFETCH.get(domain)
+        if entry is not None:
+            started, fut = entry
+            stale = now - started > PREFETCH_TTL_S
+            failed = fut.done() and fut.exception() is not None
+            if not stale and not failed:
+                return
+        query = f"{domain} 대학생 {site_filter()}"
+        _PREFETCH[domain] = (now, start_evidence_lookup(query, api_key, k=MAX_SERPER_RESULTS))
+
+
+def prefetched(domain: str) -> List[Dict[str, str]]:
+    with _PREFETCH_LOCK:
+        entry = _PREFETCH.get(domain)
+    if entry is None or not entry[1].done() or entry[1].exception() is not None:
+        return []
+    return entry[1].result()
+
+
+class HybridLookup:
+    def __init__(self, query: str, domain: str, futures: Dict[str, Future], k: int):
+        self.query = query
+        self.domain = domain
+        self.futures = futures
+        self.k = k
+
+    # 예산(timeout) 안에 끝난 검색만 모아 로컬/프리패치/큐레이션 결과와 융합한다(항상 예외 없이 반환).
+    def result(self, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ranked: Dict[str, List[Dict[str, str]]] = {}
+        for name, fut in self.futures.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                ranked[name] = fut.result(timeout=remaining)
+            except Exception:
+                continue
+        ranked["local"] = local_sources(self.query, self.domain, self.k * 2)
+        ranked["prefetch"] = prefetched(self.domain)
+        ranked["curated"] = curated_sources(self.domain)
+        return reciprocal_rank_fusion(ranked)[:self.k]
+
+
+def start_hybrid_lookup(query: str, domain: str, api_key: str, k: int = 5, local_query: str = "") -> HybridLookup:
+    # 허용 도메인 필터로 대부분 버려지므로 k의 몇 배를 요청하고, site: 필터 검색을 하나 더 병렬로 돌린다.
+    n = min(MAX_SERPER_RESULTS, k * OVERFETCH)
+    futures = {
+        "serper": start_evidence_lookup(query, api_key, k=n),
+        "serper_site": start_evidence_lookup(f"{query} {site_filter()}", api_key, k=n),
+    }
+    return HybridLookup(local_query or query, domain, futures, k)
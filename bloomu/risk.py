@@ -0,0 +1,62 @@
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Sequence
+
+from .constants import RISK_LEXICON
+
+
+class RiskMatch(NamedTuple):
+    category: str
+    term: str
+    start: int
+    end: int
+
+
+# 카테고리별 키워드 사전을 정규식 하나(단어 alternation)로 컴파일하고, 걸린 단어 → 카테고리는 dict로 찾는다.
+# (카테고리마다 이름 있는 그룹을 만들면 re의 첫 글자 최적화가 꺼져 긴 텍스트에서 오히려 느려진다.)
+# 텍스트는 한 번만 훑고, 어떤 카테고리의 어떤 단어가 어디서 걸렸는지(span)를 돌려준다.
+class RiskMatcher:
+    def __init__(self, lexicon: Dict[str, Sequence[str]]):
+        self.lexicon = {cat: list(terms) for cat, terms in lexicon.items() if terms}
+        self._category: Dict[str, str] = {}
+        for cat, terms in self.lexicon.items():
+            for t in terms:
+                self._category.setdefault(t.lower(), cat)
+        # 긴 단어를 먼저 두어야 같은 위치에서 더 구체적인 단어가 잡힌다.
+        terms = sorted(self._category, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(t) for t in terms), re.IGNORECASE) if terms else None
+
+    def scan(self, text: str) -> List[RiskMatch]:
+        if not text or self._pattern is None:
+            return []
+        return [
+            RiskMatch(self._category[m.group().lower()], m.group(), m.start(), m.end())
+            for m in self._pattern.finditer(text)
+        ]
+
+    def is_high_risk(self, text: str) -> bool:
+        return bool(text) and self._pattern is not None and self._pattern.search(text) is not None
+
+    def categories(self, text: str) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for m in self.scan(text):
+            counts[m.category] = counts.get(m.category, 0) + 1
+        return counts
+
+    # 안전 점검용: 대화 기록 전체를 한 번에 훑어 걸린 메시지만 모아 준다.
+    def scan_history(self, messages: Iterable[Dict[str, Any]], roles: Sequence[str] = ("user",)) -> List[Dict[str, Any]]:
+        flagged = []
+        for i, msg in enumerate(messages):
+            if roles and msg.get("role") not in roles:
+                continue
+            matches = self.scan(msg.get("content") or "")
+            if matches:
+                flagged.append({
+                    "index": i,
+                    "role": msg.get("role"),
+                    "categories": sorted({m.category for m in matches}),
+                    "matches": [m._asdict() for m in matches],
+                })
+        return flagged
+
+
+RISK_MATCHER = RiskMatcher(RISK_LEXICON)
@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Optional
+
+from .transport import retry_after_seconds
+
+
+def error_retry_after(err: Exception) -> Optional[float]:
+    # OpenAI SDK 예외는 .response(httpx.Response)를 들고 있다. retry-after-ms가 있으면 우선 사용.
+    headers = getattr(getattr(err, "response", None), "headers", None)
+    if headers is None:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+    return retry_after_seconds(headers)
+
+
+# API Key 1개당 1개: FIFO 대기열 + 동시 실행 수 제한 + 토큰 버킷(분당 요청 수) + 429 재시도.
+# 호출(fn)은 부른 스레드에서 그대로 실행된다(Streamlit 스크립트 스레드에서 UI 갱신 가능).
+class KeyScheduler:
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        requests_per_minute: float = 60.0,
+        burst: Optional[int] = None,
+        retries: int = 4,
+        backoff: float = 1.0,
+        max_backoff: float = 20.0,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(burst or self.max_concurrent)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._tokens = self.capacity
+        self._refilled = time.monotonic()
+        self._cooldown_until = 0.0
+        self._active = 0
+        self._queue: Deque[object] = deque()
+        self._cond = threading.Condition()
+
+    def run(
+        self,
+        fn: Callable[[], Any],
+        should_retry: Callable[[Exception], bool],
+        on_wait: Optional[Callable[[int], None]] = None,
+        on_retry: Optional[Callable[[int, float], None]] = None,
+    ) -> Any:
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+        try:
+            self._acquire(ticket, on_wait)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._cond.notify_all()
+            raise
+
+        try:
+            return self._call(fn, should_retry, on_retry)
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            return {"waiting": len(self._queue), "active": self._active, "tokens": round(self._tokens, 2)}
+
+    # ---- 내부 ----
+    def _acquire(self, ticket: object, on_wait: Optional[Callable[[int], None]]) -> None:
+        last_position = None
+        while True:
+            with self._cond:
+                position = self._queue.index(ticket) + 1
+                timeout = 0.5
+                if position == 1 and self._active < self.max_concurrent:
+                    delay = self._token_delay()
+                    if delay <= 0:
+                        self._queue.popleft()
+                        self._active += 1
+                        self._tokens -= 1
+                        self._cond.notify_all()
+                        position = 0
+                    else:
+                        timeout = min(timeout, delay)
+                if position and position == last_position:
+                    self._cond.wait(timeout)
+                    continue
+
+            # 콜백(UI 갱신)은 lock 밖에서 호출
+            if on_wait is not None and (position or last_position):
+                on_wait(position)
+            if position == 0:
+                return
+            last_position = position
+
+    def _call(
+        self,
+        fn: Callable[[], Any],
+        should_retry: Callable[[Exception], bool],
+        on_retry: Optional[Callable[[int, float], None]],
+    ) -> Any:
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as err:
+                if attempt >= self.retries or not should_retry(err):
+                    raise
+                delay = error_retry_after(err)
+                if delay is None:
+                    delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+                # 한 요청이 429를 받으면 같은 키의 다음 요청들도 함께 쉬게 한다.
+                with self._cond:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                    self._tokens = min(self._tokens, 0.0)
+                attempt += 1
+                if on_retry is not None:
+                    on_retry(attempt, delay)
+                time.sleep(delay)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _token_delay(self) -> float:
+        self._refill()
+        cooldown = self._cooldown_until - time.monotonic()
+        if cooldown > 0:
+            return cooldown
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
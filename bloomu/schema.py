@@ -0,0 +1,123 @@
+import copy
+from typing import Any, Callable, Dict
+
+from .constants import DAYS, PLAN_STATUS_OPTIONS, UNCERTAINTY_OPTIONS
+
+DEFAULT_METRICS = ["불안도0~10", "실천도%", "결과물/성과"]
+
+
+def _obj(properties: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    # strict 모드: 모든 속성 required + additionalProperties false
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+        **extra,
+    }
+
+
+def _str_list() -> Dict[str, Any]:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+def _ab_plan(title: str) -> Dict[str, Any]:
+    return _obj(
+        {"title": {"type": "string"}, "steps": _str_list(), "metrics": _str_list()},
+        default={"title": title, "steps": [], "metrics": DEFAULT_METRICS},
+    )
+
+
+COACHING_SCHEMA: Dict[str, Any] = _obj({
+    "empathy_summary": {"type": "string"},
+    "facts": {
+        "type": "array",
+        "items": _obj({
+            "text": {"type": "string"},
+            "uncertainty": {"type": "string", "enum": ["확실", "보통", "추정"], "default": "추정"},
+            "sources": {
+                "type": "array",
+                "items": _obj({"title": {"type": "string"}, "url": {"type": "string"}}),
+            },
+        }),
+    },
+    "strategies": _str_list(),
+    "uncertainty_tag": {"type": "string", "enum": UNCERTAINTY_OPTIONS, "default": UNCERTAINTY_OPTIONS[2]},
+    "ab_plans": _obj({"A": _ab_plan("플랜 A"), "B": _ab_plan("플랜 B")}),
+    "weekly_active_plan": {
+        "type": "array",
+        "items": _obj({
+            "day": {"type": "string", "enum": DAYS + [""], "default": ""},
+            "task": {"type": "string"},
+            "status": {"type": "string", "enum": PLAN_STATUS_OPTIONS, "default": "진행중"},
+        }),
+    },
+    "risk_warning": _obj({
+        "is_high_risk": {"type": "boolean"},
+        "message": {"type": "string"},
+        "safe_actions": _str_list(),
+    }),
+})
+
+
+def api_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # API(strict json_schema)에는 default 키워드를 빼고 보낸다. default는 로컬 검증기 전용.
+    if isinstance(schema, dict):
+        return {k: api_schema(v) for k, v in schema.items() if k != "default"}
+    if isinstance(schema, list):
+        return [api_schema(v) for v in schema]
+    return schema
+
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    # 스키마를 한 번만 해석해 노드별 변환 함수(클로저)로 만들어 둔다.
+    # 결과 함수는 값을 한 번 훑으면서 타입이 틀리거나 빠진 곳을 default로 채운 "정상 모양"을 돌려준다.
+    kind = schema.get("type")
+    has_default = "default" in schema
+    default = schema.get("default")
+
+    def fallback() -> Any:
+        return copy.deepcopy(default)
+
+    if kind == "object":
+        fields = {k: compile_validator(v) for k, v in schema.get("properties", {}).items()}
+
+        def validate_object(v: Any) -> Any:
+            if not isinstance(v, dict):
+                if has_default:
+                    return fallback()
+                v = {}
+            return {k: f(v.get(k)) for k, f in fields.items()}
+        return validate_object
+
+    if kind == "array":
+        item = compile_validator(schema.get("items", {}))
+
+        def validate_array(v: Any) -> Any:
+            if not isinstance(v, list):
+                return fallback() if has_default else []
+            return [item(x) for x in v]
+        return validate_array
+
+    if kind == "string":
+        enum = set(schema.get("enum") or [])
+
+        def validate_string(v: Any) -> Any:
+            if isinstance(v, str):
+                v = v.strip()
+            elif v is None:
+                v = ""
+            else:
+                v = str(v)
+            if enum and v not in enum:
+                return default if has_default else ""
+            return v
+        return validate_string
+
+    if kind == "boolean":
+        return lambda v: v if isinstance(v, bool) else bool(default)
+
+    return lambda v: v
+
+
+validate_coaching = compile_validator(COACHING_SCHEMA)
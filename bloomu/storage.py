@@ -0,0 +1,85 @@
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+
+# 저장 단위(kind): task / survey / ab_metrics / daily / core_week / message
+# 한 번에 dict 전체를 쓰지 않고, 바뀐 레코드(행) 1개만 upsert 한다.
+class Storage(ABC):
+    @abstractmethod
+    def load(self, user_id: str, kind: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def put(self, user_id: str, kind: str, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, user_id: str, kind: str, key: str) -> None:
+        ...
+
+    # 사용자 키 교체(예전 ?uid= 링크의 기록을 새 키로 옮길 때)
+    @abstractmethod
+    def rekey(self, old_user_id: str, new_user_id: str) -> None:
+        ...
+
+
+class SQLiteStorage(Storage):
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Streamlit은 세션마다 다른 스레드에서 스크립트를 돌리므로 커넥션 1개를 lock으로 공유
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    user_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    PRIMARY KEY (user_id, kind, key)
+                )
+                """
+            )
+            self._conn.commit()
+
+    def load(self, user_id: str, kind: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, body FROM records WHERE user_id = ? AND kind = ? ORDER BY rowid",
+                (user_id, kind),
+            ).fetchall()
+        return {k: json.loads(body) for k, body in rows}
+
+    def put(self, user_id: str, kind: str, key: str, value: Any) -> None:
+        body = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO records (user_id, kind, key, body) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(user_id, kind, key) DO UPDATE SET body = excluded.body",
+                (user_id, kind, key, body),
+            )
+            self._conn.commit()
+
+    def delete(self, user_id: str, kind: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM records WHERE user_id = ? AND kind = ? AND key = ?",
+                (user_id, kind, key),
+            )
+            self._conn.commit()
+
+    def rekey(self, old_user_id: str, new_user_id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE records SET user_id = ? WHERE user_id = ?", (new_user_id, old_user_id))
+            self._conn.commit()
+
+
+def task_row_key(t: Dict[str, Any]) -> str:
+    # PlanStore에 들어간 task는 항상 id를 가진다(ensure_task_shape에서 부여).
+    return t["id"]
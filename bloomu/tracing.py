@@ -0,0 +1,106 @@
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+# 채팅 1턴의 단계별 소요 시간(ms). 같은 이름의 단계를 여러 번 재면 합산한다.
+class TurnTrace:
+    def __init__(self, name: str = "chat_turn"):
+        self.name = name
+        self.started_at = time.time()
+        self.stages: Dict[str, float] = {}
+        self.meta: Dict[str, Any] = {}
+        self._t0 = time.perf_counter()
+        self.total_ms: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - t) * 1000
+
+    def finish(self) -> "TurnTrace":
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self._t0) * 1000
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms or 0.0, 2),
+            "stages": {k: round(v, 2) for k, v in self.stages.items()},
+            "meta": self.meta,
+        }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    # nearest-rank
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+    return ordered[idx]
+
+
+# 최근 N턴의 trace를 링 버퍼로 보관하고, 단계별 p50/p95 요약과 JSON/Prometheus 내보내기를 제공한다.
+class Tracer:
+    def __init__(self, maxlen: int = 200):
+        self._traces: Deque[TurnTrace] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, trace: TurnTrace) -> None:
+        trace.finish()
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, n: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            traces = list(self._traces)[-n:]
+        return [t.to_dict() for t in traces]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            traces = list(self._traces)
+        samples: Dict[str, List[float]] = {}
+        for t in traces:
+            for name, ms in t.stages.items():
+                samples.setdefault(name, []).append(ms)
+            samples.setdefault("total", []).append(t.total_ms or 0.0)
+
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.5), 2),
+                "p95_ms": round(_percentile(values, 0.95), 2),
+                "max_ms": round(max(values), 2),
+                "sum_ms": round(sum(values), 2),
+            }
+            for name, values in samples.items()
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({"summary": self.summary(), "traces": self.recent(len(self._traces))}, ensure_ascii=False)
+
+    def to_prometheus(self, metric: str = "bloomu_turn_stage_seconds") -> str:
+        lines = [
+            f"# HELP {metric} Latency of each chat turn stage (recent ring buffer).",
+            f"# TYPE {metric} summary",
+        ]
+        for name, s in sorted(self.summary().items()):
+            label = f'stage="{name}"'
+            lines.append(f'{metric}{{{label},quantile="0.5"}} {s["p50_ms"] / 1000:.6f}')
+            lines.append(f'{metric}{{{label},quantile="0.95"}} {s["p95_ms"] / 1000:.6f}')
+            lines.append(f"{metric}_sum{{{label}}} {s['sum_ms'] / 1000:.6f}")
+            lines.append(f"{metric}_count{{{label}}} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+    # 확장자가 .prom이면 Prometheus 텍스트, 그 외에는 JSON으로 저장
+    def export(self, path: str) -> None:
+        body = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
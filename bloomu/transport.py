@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_RETRY_AFTER_S = 30.0
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+# Serper/Notion이 함께 쓰는 커넥션 풀(keep-alive). 프로세스당 1개.
+def get_session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    # full jitter: 0 ~ min(cap, base * 2^attempt)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _retry_after_delay(resp: requests.Response) -> Optional[float]:
+    return retry_after_seconds(resp.headers)
+
+
+# Retry-After 헤더(초 또는 HTTP-date)를 대기 초로 변환. requests/httpx 헤더 모두 사용 가능.
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    value = (headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER_S, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        delay = parsedate_to_datetime(value).timestamp() - time.time()
+        return min(MAX_RETRY_AFTER_S, max(0.0, delay))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_connect_error(err: Exception) -> bool:
+    # 서버에 요청이 전달되기 전(연결 단계)에 실패한 경우만 True → 재전송해도 중복 생성이 없다.
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = err.args[0] if err.args else None
+    reason = getattr(reason, "reason", reason)  # MaxRetryError → 실제 원인
+    return isinstance(reason, NewConnectionError)
+
+
+def request_with_retry(
+    method: str,
+    url: str,
+    retries: int = 3,
+    backoff: float = 0.5,
+    max_backoff: float = 8.0,
+    idempotent: Optional[bool] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    # 429는 항상, 연결 단계 실패도 항상 재시도(서버가 요청을 받지 못했으므로 안전).
+    # 5xx와 읽기 실패(타임아웃/끊김)는 멱등 요청(GET/DELETE 등)만 재시도한다.
+    # POST/PATCH(페이지 생성, 블록 추가)는 서버가 이미 반영했을 수 있어 재전송하면 중복이 생긴다.
+    # 읽기 전용 POST(예: 검색)는 idempotent=True로 넘긴다.
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    retry_status = RETRY_STATUS if idempotent else {429}
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as err:
+            if attempt >= retries or not (idempotent or _is_connect_error(err)):
+                raise
+            time.sleep(_backoff_delay(attempt, backoff, max_backoff))
+            attempt += 1
+            continue
+
+        if resp.status_code not in retry_status or attempt >= retries:
+            return resp
+
+        delay = _retry_after_delay(resp)
+        time.sleep(delay if delay is not None else _backoff_delay(attempt, backoff, max_backoff))
+        attempt += 1
+
+
+# 초당 요청 수 제한(예: Notion 평균 3 req/s). 여러 스레드가 같은 limiter를 공유한다.
+class RateLimiter:
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,38 @@
+import pytest
+
+from bloomu.allowlist import DomainAllowlist, SOURCE_ALLOWLIST
+
+
+@pytest.mark.parametrize("url", [
+    "https://evil.gov.example.com/page",
+    "https://notwho.int/",
+    "https://who.int.evil.com/",
+    "https://example.com/?next=https://www.cdc.gov/",
+    "ftp://www.cdc.gov/file",
+    "not a url",
+])
+def test_rejects_hosts_that_only_contain_an_allowed_suffix(url):
+    assert not SOURCE_ALLOWLIST.is_allowed(url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.cdc.gov/sleep/",
+    "https://studentaid.gov/",
+    "https://who.int/",
+    "https://www.who.int/news-room/fact-sheets/detail/depression",
+    "https://WWW.APA.ORG/topics/stress",
+    "https://www.moel.go.kr./",
+])
+def test_accepts_label_boundary_matches(url):
+    assert SOURCE_ALLOWLIST.is_allowed(url)
+
+
+def test_filter_allowed_keeps_order_and_drops_the_rest():
+    allowlist = DomainAllowlist([".gov", "who.int"])
+    items = [
+        {"url": "https://www.nih.gov/"},
+        {"url": "https://evil.gov.example.com/"},
+        {"url": "https://www.who.int/"},
+        {"url": ""},
+    ]
+    assert allowlist.filter_allowed(items) == [items[0], items[2]]
@@ -0,0 +1,26 @@
+from bloomu.daily import DailyPatternColumns, DailyRollup
+
+
+def _columns():
+    # 2026-01-02에는 수분/수면만 기록(나머지 지표는 없음)
+    return DailyPatternColumns.from_records({
+        "2026-01-01": {"water": 2, "exercise": 5, "sleep": 4, "condition": 3, "custom": 1},
+        "2026-01-02": {"water": 4, "sleep": 2},
+    })
+
+
+def test_missing_metric_reads_back_as_none():
+    rec = _columns()["2026-01-02"]
+    assert rec["water"] == 4
+    assert rec["exercise"] is None
+
+
+def test_missing_metric_is_skipped_in_rollup_and_frame():
+    cols = _columns()
+    monthly = DailyRollup.from_records(cols).monthly_frame()
+    assert monthly.loc["2026-01", "exercise"] == 5.0
+    assert monthly.loc["2026-01", "water"] == 3.0
+
+    means = cols.to_frame().mean()
+    assert means["exercise"] == 5.0
+    assert means["condition"] == 3.0
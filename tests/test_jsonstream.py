@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from bloomu.jsonstream import IncrementalJSONObject, parse_json_tolerant, repair_json
+
+ANSWER = {
+    "empathy_summary": "많이 지쳤겠어요. {괄호}도 \"따옴표\"도 문자열이에요.",
+    "facts": [{"text": "수면은 기억에 중요해요.", "sources": [{"url": "https://www.cdc.gov/sleep/"}]}],
+    "strategies": ["25분 집중", "5분 휴식"],
+    "uncertainty_tag": "추정(개인화)",
+}
+
+
+def test_sections_complete_in_order_across_arbitrary_chunks():
+    raw = "```json\n" + json.dumps(ANSWER, ensure_ascii=False) + "\n```"
+    for size in (1, 3, 17):
+        parser = IncrementalJSONObject()
+        completed = []
+        for i in range(0, len(raw), size):
+            completed.extend(parser.feed(raw[i:i + size]))
+        assert completed == list(ANSWER)
+        assert parser.close() == ANSWER
+
+
+def test_close_repairs_a_string_cut_mid_value():
+    parser = IncrementalJSONObject()
+    parser.feed('{"empathy_summary": "괜찮아요", "strategies": ["25분 집중", "5분 휴')
+    assert parser.close() == {"empathy_summary": "괜찮아요", "strategies": ["25분 집중", "5분 휴"]}
+
+
+def test_repair_drops_a_dangling_key():
+    assert repair_json('{"a": 1, "facts": [{"text": "x"}], "b":') == {"a": 1, "facts": [{"text": "x"}]}
+
+
+def test_repair_closes_nested_arrays():
+    assert repair_json('{"facts": [{"sources": [{"url": "https://who.int/"') == {
+        "facts": [{"sources": [{"url": "https://who.int/"}]}]
+    }
+
+
+def test_unrecoverable_input_raises():
+    assert repair_json("응답 없음") is None
+    with pytest.raises(ValueError):
+        parse_json_tolerant("응답 없음")
+    with pytest.raises(ValueError):
+        IncrementalJSONObject().close()
@@ -0,0 +1,39 @@
+import pytest
+
+from bloomu.helpers import ensure_task_shape, merge_weekly_plan
+from bloomu.plan_store import PlanStore
+
+WK = "2026-W10"
+
+
+def _answer_rows(created_at: str):
+    # 같은 코칭 답변(같은 created_at)에서 한 할일을 여러 요일에 배치한 경우
+    return [{"week": WK, "day": day, "task": "30분 운동", "status": "진행중", "created_at": created_at} for day in ("월", "수", "금")]
+
+
+def test_same_task_on_several_days_keeps_every_row():
+    new_tasks = [ensure_task_shape(t, WK) for t in _answer_rows("2026-03-02T09:00:00")]
+    assert len({t["id"] for t in new_tasks}) == 3
+
+    merged = merge_weekly_plan([], new_tasks, WK)
+    store = PlanStore()
+    store.replace_week(WK, merged)
+
+    assert store.count(WK) == 3
+    assert sorted(t["day"] for t in store.get(WK)) == ["금", "수", "월"]
+    for day in ("월", "수", "금"):
+        assert len(store.day_items(WK, day)) == 1
+
+
+def test_id_survives_reshaping():
+    t = ensure_task_shape({"task": "독서", "day": "화"}, WK)
+    assert ensure_task_shape(t, WK)["id"] == t["id"]
+
+
+def test_add_rejects_duplicate_id():
+    store = PlanStore()
+    t = store.add({"task": "독서", "day": "화"}, WK)
+    with pytest.raises(ValueError):
+        store.add(dict(t, day="목"), WK)
+    assert store.count(WK) == 1
+    assert store.get_task(t["id"])["day"] == "화"
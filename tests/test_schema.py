@@ -0,0 +1,31 @@
+from bloomu.constants import UNCERTAINTY_OPTIONS
+from bloomu.schema import COACHING_SCHEMA, DEFAULT_METRICS, api_schema, validate_coaching
+
+
+def test_missing_fields_are_filled_with_the_right_shape():
+    out = validate_coaching({})
+    assert out["empathy_summary"] == ""
+    assert out["facts"] == [] and out["weekly_active_plan"] == []
+    assert out["ab_plans"]["A"] == {"title": "플랜 A", "steps": [], "metrics": DEFAULT_METRICS}
+    assert out["risk_warning"] == {"is_high_risk": False, "message": "", "safe_actions": []}
+
+
+def test_enum_values_fall_back_to_their_defaults():
+    out = validate_coaching({
+        "uncertainty_tag": "모름",
+        "facts": [{"text": " 사실 ", "uncertainty": "아마도", "sources": "https://cdc.gov"}],
+        "weekly_active_plan": [{"day": "Monday", "task": "운동", "status": "완료"}],
+    })
+    assert out["uncertainty_tag"] == UNCERTAINTY_OPTIONS[2]
+    assert out["facts"] == [{"text": "사실", "uncertainty": "추정", "sources": []}]
+    assert out["weekly_active_plan"] == [{"day": "", "task": "운동", "status": "진행중"}]
+
+
+def test_wrong_typed_ab_plan_uses_the_plan_default():
+    out = validate_coaching({"ab_plans": {"A": "계획 없음", "B": {"title": "B안", "steps": ["걷기"]}}})
+    assert out["ab_plans"]["A"] == {"title": "플랜 A", "steps": [], "metrics": DEFAULT_METRICS}
+    assert out["ab_plans"]["B"] == {"title": "B안", "steps": ["걷기"], "metrics": []}
+
+
+def test_api_schema_strips_local_defaults():
+    assert "default" not in str(api_schema(COACHING_SCHEMA))
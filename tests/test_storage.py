@@ -0,0 +1,27 @@
+import pytest
+
+from bloomu.storage import SQLiteStorage, Storage
+
+
+def test_storage_base_is_abstract():
+    with pytest.raises(TypeError):
+        Storage()
+
+
+def test_deleted_task_row_is_not_loaded_again(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "bloomu.db"))
+    storage.put("u1", "task", "a", {"task": "요일 없는 액션"})
+    storage.put("u1", "task", "b", {"task": "30분 운동", "day": "월"})
+
+    # merge에서 빠진 액션을 지운 뒤 다시 불러오면 남은 행만 보여야 한다.
+    storage.delete("u1", "task", "a")
+    assert list(SQLiteStorage(storage.path).load("u1", "task")) == ["b"]
+
+
+def test_rekey_moves_rows_to_the_new_user_key(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "bloomu.db"))
+    storage.put("legacy-uid", "message", "m1", {"role": "user", "content": "안녕"})
+
+    storage.rekey("legacy-uid", "derived-key")
+    assert storage.load("legacy-uid", "message") == {}
+    assert list(storage.load("derived-key", "message")) == ["m1"]